@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class FatigueAnalysisConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'fatigue_analysis'
+
+    def ready(self):
+        """Load the ML predictor once per process so forked workers share it."""
+        try:
+            from ml_models.fatigue_predictor import predict_fatigue, get_recommendations
+        except ImportError:
+            # Fallback if ML model is not available
+            from .fallback import predict_fatigue, get_recommendations
+
+        self.predict_fatigue = predict_fatigue
+        self.get_recommendations = get_recommendations
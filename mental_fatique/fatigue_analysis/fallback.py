@@ -0,0 +1,21 @@
+"""
+Fallback predictor used when the ML model is not available.
+"""
+
+
+def predict_fatigue(typing_data=None, mouse_data=None, facial_data=None):
+    return {
+        'combined_fatigue_score': 45,
+        'individual_scores': {'typing': 45, 'mouse': 45, 'facial': 45},
+        'confidence': 0.5,
+        'data_quality': {'typing_available': False, 'mouse_available': False, 'facial_available': False}
+    }
+
+
+def get_recommendations(fatigue_score, individual_scores=None):
+    return {
+        'recommendations': [{'type': 'Break', 'action': 'Take a break', 'description': 'Rest for a while', 'duration': '10 minutes', 'priority': 'medium'}],
+        'insights': ['No ML model available'],
+        'fatigue_level': 'Moderate',
+        'timestamp': '2024-01-01T00:00:00'
+    }
@@ -0,0 +1,12 @@
+"""
+Serializers for the fatigue analysis endpoints.
+"""
+
+from rest_framework import serializers
+
+
+class InsightsQuerySerializer(serializers.Serializer):
+    fatigue_score = serializers.FloatField(default=45)
+    typing_score = serializers.FloatField(required=False)
+    mouse_score = serializers.FloatField(required=False)
+    facial_score = serializers.FloatField(required=False)
@@ -3,35 +3,21 @@ Views for fatigue analysis and ML model integration.
 """
 
 import json
-import sys
-import os
+from django.apps import apps
 from django.http import JsonResponse
+from django.middleware.http import ConditionalGetMiddleware
+from django.utils.decorators import decorator_from_middleware
+from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.views.decorators.vary import vary_on_headers
 from django.shortcuts import render
 
-# Add the ml_models directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ml_models'))
+from .serializers import InsightsQuerySerializer
 
-try:
-    from fatigue_predictor import predict_fatigue, get_recommendations
-except ImportError:
-    # Fallback if ML model is not available
-    def predict_fatigue(typing_data=None, mouse_data=None, facial_data=None):
-        return {
-            'combined_fatigue_score': 45,
-            'individual_scores': {'typing': 45, 'mouse': 45, 'facial': 45},
-            'confidence': 0.5,
-            'data_quality': {'typing_available': False, 'mouse_available': False, 'facial_available': False}
-        }
-    
-    def get_recommendations(fatigue_score, individual_scores=None):
-        return {
-            'recommendations': [{'type': 'Break', 'action': 'Take a break', 'description': 'Rest for a while', 'duration': '10 minutes', 'priority': 'medium'}],
-            'insights': ['No ML model available'],
-            'fatigue_level': 'Moderate',
-            'timestamp': '2024-01-01T00:00:00'
-        }
+def get_predictor():
+    """Return the app config holding the preloaded ML predictor."""
+    return apps.get_app_config('fatigue_analysis')
 
 @csrf_exempt
 @require_http_methods(["POST"])
@@ -55,10 +41,10 @@ def analyze_fatigue(request):
         facial_data = data.get('facial_data')
         
         # Use ML model to predict fatigue
-        prediction_result = predict_fatigue(typing_data, mouse_data, facial_data)
+        prediction_result = get_predictor().predict_fatigue(typing_data, mouse_data, facial_data)
         
         # Get personalized recommendations
-        recommendations = get_recommendations(
+        recommendations = get_predictor().get_recommendations(
             prediction_result['combined_fatigue_score'],
             prediction_result['individual_scores']
         )
@@ -85,43 +71,47 @@ def analyze_fatigue(request):
             'message': f'Analysis failed: {str(e)}'
         }, status=500)
 
+# ETag hashed from the outgoing body, cached or not, so it changes exactly
+# when the insights do and a 304 never pins an expired response
+conditional_get = decorator_from_middleware(ConditionalGetMiddleware)
+
 @csrf_exempt
 @require_http_methods(["GET"])
+@conditional_get
+@cache_page(30, key_prefix='fatigue-insights')
+@vary_on_headers('Accept-Encoding')
 def get_fatigue_insights(request):
     """
     Get insights and recommendations based on current fatigue level.
     """
     try:
-        # Get fatigue score from query parameters
-        fatigue_score = float(request.GET.get('fatigue_score', 45))
+        # Validate all query parameters in a single pass
+        query = InsightsQuerySerializer(data=request.GET)
+        if not query.is_valid():
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Invalid fatigue score format',
+                'errors': query.errors
+            }, status=400)
         
-        # Get individual scores if provided
-        typing_score = request.GET.get('typing_score')
-        mouse_score = request.GET.get('mouse_score')
-        facial_score = request.GET.get('facial_score')
+        params = query.validated_data
+        fatigue_score = params['fatigue_score']
         
-        individual_scores = {}
-        if typing_score:
-            individual_scores['typing'] = float(typing_score)
-        if mouse_score:
-            individual_scores['mouse'] = float(mouse_score)
-        if facial_score:
-            individual_scores['facial'] = float(facial_score)
+        # Get individual scores if provided
+        individual_scores = {
+            name: params[f'{name}_score']
+            for name in ('typing', 'mouse', 'facial')
+            if f'{name}_score' in params
+        }
         
         # Get recommendations
-        recommendations = get_recommendations(fatigue_score, individual_scores if individual_scores else None)
+        recommendations = get_predictor().get_recommendations(fatigue_score, individual_scores if individual_scores else None)
         
         return JsonResponse({
             'status': 'success',
             'recommendations': recommendations
         })
         
-    except ValueError:
-        return JsonResponse({
-            'status': 'error',
-            'message': 'Invalid fatigue score format'
-        }, status=400)
-    
     except Exception as e:
         return JsonResponse({
             'status': 'error',
@@ -21,42 +21,49 @@ class BehavioralDataAdmin(admin.ModelAdmin):
     list_display = ('user', 'data_type', 'timestamp')
     list_filter = ('data_type', 'timestamp')
     search_fields = ('user__username',)
+    ordering = ('-timestamp',)
 
 @admin.register(KeyboardMetrics)
 class KeyboardMetricsAdmin(admin.ModelAdmin):
     list_display = ('user', 'typing_speed', 'error_rate', 'pause_frequency', 'timestamp')
     list_filter = ('timestamp',)
     search_fields = ('user__username',)
+    ordering = ('-timestamp',)
 
 @admin.register(MouseMetrics)
 class MouseMetricsAdmin(admin.ModelAdmin):
     list_display = ('user', 'movement_speed', 'click_frequency', 'timestamp')
     list_filter = ('timestamp',)
     search_fields = ('user__username',)
+    ordering = ('-timestamp',)
 
 @admin.register(FacialMetrics)
 class FacialMetricsAdmin(admin.ModelAdmin):
     list_display = ('user', 'eye_blink_rate', 'facial_expression', 'timestamp')
     list_filter = ('facial_expression', 'timestamp')
     search_fields = ('user__username',)
+    ordering = ('-timestamp',)
 
 @admin.register(VoiceMetrics)
 class VoiceMetricsAdmin(admin.ModelAdmin):
     list_display = ('user', 'speech_rate', 'volume', 'clarity', 'timestamp')
     list_filter = ('timestamp',)
     search_fields = ('user__username',)
+    ordering = ('-timestamp',)
 
 @admin.register(FatigueAnalysis)
 class FatigueAnalysisAdmin(admin.ModelAdmin):
     list_display = ('user', 'fatigue_level', 'fatigue_score', 'confidence', 'timestamp')
     list_filter = ('fatigue_level', 'timestamp')
     search_fields = ('user__username',)
+    ordering = ('-timestamp',)
 
 @admin.register(ProductivityRecommendation)
 class ProductivityRecommendationAdmin(admin.ModelAdmin):
     list_display = ('user', 'recommendation_type', 'expected_impact', 'implemented', 'timestamp')
     list_filter = ('recommendation_type', 'implemented', 'timestamp')
     search_fields = ('user__username', 'description')
+    ordering = ('-timestamp',)
 
 @admin.register(ProductivitySession)
 class ProductivitySessionAdmin(admin.ModelAdmin):
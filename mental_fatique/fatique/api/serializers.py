@@ -2,8 +2,10 @@
 Serializers for the API endpoints.
 """
 
+import copy
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
 from ..models import (
     UserProfile,
     BehavioralData,
@@ -16,13 +18,39 @@ from ..models import (
     ProductivitySession
 )
 
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's field map once per class. Later instances get a
+    deep copy instead of repeating the model introspection in get_fields().
+    """
+    
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get('_fields_cache')
+        if fields is None:
+            fields = super().get_fields()
+            cls._fields_cache = fields
+        return copy.deepcopy(fields)
+
+def include_raw_data(request):
+    """Whether the request explicitly asked for raw behavioral payloads."""
+    return request is not None and request.GET.get('include_raw') == '1'
+
+class TimestampedSerializer(serializers.ModelSerializer):
+    """Base serializer for time-series models with read-only id and timestamp."""
+    # Pre-formatted at write time, so no per-row datetime formatting
+    timestamp = serializers.CharField(source='timestamp_iso', read_only=True)
+    
+    class Meta:
+        read_only_fields = ('id', 'timestamp')
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
         read_only_fields = ['id']
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     
     class Meta:
@@ -30,49 +58,60 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'age', 'occupation', 'work_hours_per_day', 'baseline_productivity', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-class BehavioralDataSerializer(serializers.ModelSerializer):
-    class Meta:
+class BehavioralDataSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = BehavioralData
         fields = ['id', 'user', 'data_type', 'raw_data', 'timestamp']
-        read_only_fields = ['id', 'timestamp']
+    
+    @property
+    def _readable_fields(self):
+        """Leave raw_data out of list responses unless asked for with ?include_raw=1."""
+        fields = super()._readable_fields
+        view = self.context.get('view')
+        if getattr(view, 'action', None) != 'list' or include_raw_data(self.context.get('request')):
+            return fields
+        return (field for field in fields if field.field_name != 'raw_data')
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'raw_data' in data and instance.raw_blob:
+            # Expand binary samples to JSON columns only for clients that asked
+            data['raw_data'] = dict(data['raw_data'], **{
+                name: values.tolist() for name, values in instance.raw_arrays().items()
+            })
+        return data
 
-class KeyboardMetricsSerializer(serializers.ModelSerializer):
-    class Meta:
+class KeyboardMetricsSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = KeyboardMetrics
         fields = ['id', 'user', 'typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration', 'timestamp']
-        read_only_fields = ['id', 'timestamp']
 
-class MouseMetricsSerializer(serializers.ModelSerializer):
-    class Meta:
+class MouseMetricsSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = MouseMetrics
         fields = ['id', 'user', 'movement_speed', 'click_frequency', 'movement_pattern', 'timestamp']
-        read_only_fields = ['id', 'timestamp']
 
-class FacialMetricsSerializer(serializers.ModelSerializer):
-    class Meta:
+class FacialMetricsSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = FacialMetrics
         fields = ['id', 'user', 'eye_blink_rate', 'eye_closure_duration', 'facial_expression', 'head_position', 'timestamp']
-        read_only_fields = ['id', 'timestamp']
 
-class VoiceMetricsSerializer(serializers.ModelSerializer):
-    class Meta:
+class VoiceMetricsSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = VoiceMetrics
         fields = ['id', 'user', 'speech_rate', 'pitch_variation', 'volume', 'clarity', 'timestamp']
-        read_only_fields = ['id', 'timestamp']
 
-class FatigueAnalysisSerializer(serializers.ModelSerializer):
-    class Meta:
+class FatigueAnalysisSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = FatigueAnalysis
         fields = ['id', 'user', 'fatigue_level', 'fatigue_score', 'confidence', 'contributing_factors', 'timestamp']
-        read_only_fields = ['id', 'timestamp']
 
-class ProductivityRecommendationSerializer(serializers.ModelSerializer):
-    class Meta:
+class ProductivityRecommendationSerializer(CachedFieldsMixin, TimestampedSerializer):
+    class Meta(TimestampedSerializer.Meta):
         model = ProductivityRecommendation
         fields = ['id', 'user', 'recommendation_type', 'description', 'expected_impact', 'duration', 'timestamp', 'implemented', 'effectiveness']
-        read_only_fields = ['id', 'timestamp']
 
-class ProductivitySessionSerializer(serializers.ModelSerializer):
+class ProductivitySessionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     recommendations_followed = ProductivityRecommendationSerializer(many=True, read_only=True)
     
     class Meta:
@@ -95,20 +134,23 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         occupation = validated_data.pop('occupation', '')
         work_hours_per_day = validated_data.pop('work_hours_per_day', 8.0)
         
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data.get('email', ''),
-            password=validated_data['password'],
-            first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', '')
-        )
-        
-        UserProfile.objects.create(
-            user=user,
-            age=age,
-            occupation=occupation,
-            work_hours_per_day=work_hours_per_day
-        )
+        # Create the user and profile in a single transaction
+        with transaction.atomic():
+            user = User(
+                username=User.normalize_username(validated_data['username']),
+                email=User.objects.normalize_email(validated_data.get('email', '')),
+                first_name=validated_data.get('first_name', ''),
+                last_name=validated_data.get('last_name', '')
+            )
+            user.set_password(validated_data['password'])
+            user.save()
+            
+            UserProfile.objects.create(
+                user=user,
+                age=age,
+                occupation=occupation,
+                work_hours_per_day=work_hours_per_day
+            )
         
         return user
 
@@ -121,3 +163,29 @@ class FatigueHistorySerializer(serializers.Serializer):
     start_date = serializers.DateTimeField()
     end_date = serializers.DateTimeField()
     interval = serializers.ChoiceField(choices=['hour', 'day', 'week'], default='day')
+
+class TypingSnapshotSerializer(serializers.Serializer):
+    """One typing snapshot posted by the data collection page."""
+    typingSpeed = serializers.FloatField(source='typing_speed', default=0)
+    errorRate = serializers.FloatField(source='error_rate', default=0)
+    pauseFrequency = serializers.FloatField(source='pause_frequency', default=0)
+    keyPressDuration = serializers.FloatField(source='key_press_duration', default=0)
+
+class MouseSnapshotSerializer(serializers.Serializer):
+    """One mouse snapshot posted by the data collection page."""
+    movementSpeed = serializers.FloatField(source='movement_speed', default=0)
+    clickFrequency = serializers.FloatField(source='click_frequency', default=0)
+    movementPattern = serializers.JSONField(source='movement_pattern', default=dict)
+
+class FacialSnapshotSerializer(serializers.Serializer):
+    """One facial snapshot posted by the data collection page."""
+    blinkRate = serializers.FloatField(source='eye_blink_rate', default=0)
+    eyeClosure = serializers.FloatField(source='eye_closure_duration', default=0)
+    expression = serializers.CharField(source='facial_expression', max_length=50, default='neutral')
+    headPosition = serializers.JSONField(source='head_position', default=dict)
+
+class DataCollectionSerializer(serializers.Serializer):
+    """Batches of snapshots, one list per modality, keyed by model field name."""
+    typing = TypingSnapshotSerializer(many=True, default=list)
+    mouse = MouseSnapshotSerializer(many=True, default=list)
+    facial = FacialSnapshotSerializer(many=True, default=list)
@@ -4,9 +4,16 @@ API views for the mental fatigue detection system.
 
 from rest_framework import viewsets, permissions, status, generics
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count
+from django.db.models.functions import TruncDay, TruncHour, TruncWeek
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
 import json
@@ -36,11 +43,30 @@ from .serializers import (
     ProductivitySessionSerializer,
     UserRegistrationSerializer,
     RecommendationFeedbackSerializer,
-    FatigueHistorySerializer
+    FatigueHistorySerializer,
+    DataCollectionSerializer,
+    include_raw_data
 )
 
-from ..ml_models.fatigue_detector import FatigueDetector
-from ..ml_models.recommendation_engine import RecommendationEngine
+from ..ml_models import get_recommender
+from ..tasks import enqueue_fatigue_prediction, enqueue_recommendation
+from ..data_collection.storage import IngestBuffer
+from ..cache import (
+    DASHBOARD_TIMEOUT,
+    CURRENT_FATIGUE_TIMEOUT,
+    dashboard_key,
+    current_fatigue_key,
+    get_latest_fatigue,
+    recommendation_key,
+    invalidate_user_cache
+)
+
+# Truncation function and label format for each history interval
+HISTORY_BUCKETS = {
+    'hour': (TruncHour, '%Y-%m-%d %H:00'),
+    'day': (TruncDay, '%Y-%m-%d'),
+    'week': (TruncWeek, '%Y-%W'),
+}
 
 class UserRegistrationView(generics.CreateAPIView):
     """API endpoint for user registration."""
@@ -66,7 +92,11 @@ class BehavioralDataViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return BehavioralData.objects.filter(user=self.request.user)
+        queryset = BehavioralData.objects.filter(user=self.request.user).order_by('-timestamp')
+        if self.action == 'list' and not include_raw_data(self.request):
+            # raw_data can be megabytes of trace JSON; skip it unless requested
+            queryset = queryset.defer('raw_data', 'raw_blob')
+        return queryset
     
     def perform_create(self, serializer):
         """Set the user to the current user when creating a new object."""
@@ -80,7 +110,7 @@ class KeyboardMetricsViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return KeyboardMetrics.objects.filter(user=self.request.user)
+        return KeyboardMetrics.objects.filter(user=self.request.user).order_by('-timestamp')
     
     def perform_create(self, serializer):
         """Set the user to the current user when creating a new object."""
@@ -94,7 +124,7 @@ class MouseMetricsViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return MouseMetrics.objects.filter(user=self.request.user)
+        return MouseMetrics.objects.filter(user=self.request.user).order_by('-timestamp')
     
     def perform_create(self, serializer):
         """Set the user to the current user when creating a new object."""
@@ -108,7 +138,7 @@ class FacialMetricsViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return FacialMetrics.objects.filter(user=self.request.user)
+        return FacialMetrics.objects.filter(user=self.request.user).order_by('-timestamp')
     
     def perform_create(self, serializer):
         """Set the user to the current user when creating a new object."""
@@ -122,7 +152,7 @@ class VoiceMetricsViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return VoiceMetrics.objects.filter(user=self.request.user)
+        return VoiceMetrics.objects.filter(user=self.request.user).order_by('-timestamp')
     
     def perform_create(self, serializer):
         """Set the user to the current user when creating a new object."""
@@ -136,26 +166,46 @@ class FatigueAnalysisViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return FatigueAnalysis.objects.filter(user=self.request.user)
+        return FatigueAnalysis.objects.filter(user=self.request.user).order_by('-timestamp')
     
     @action(detail=False, methods=['get'])
     def current(self, request):
-        """Get the current fatigue analysis."""
-        # Get the latest fatigue analysis
-        latest = FatigueAnalysis.objects.filter(user=request.user).order_by('-timestamp').first()
+        """
+        Get the current fatigue analysis.
+        
+        Returns 200 with an analysis from the last hour. Otherwise a fresh
+        prediction is queued and the response is 202: the latest older
+        analysis with "stale": true, or {"status": "pending"} if the user
+        has none yet.
+        """
+        key = current_fatigue_key(request.user.id)
+        cached = cache.get(key)
+        if cached is not None:
+            return Response(cached)
+        
+        # Only consider recent analyses (within the last hour), so the
+        # (user, -timestamp) index bounds the scan
+        analyses = FatigueAnalysis.objects.filter(user=request.user).only(
+            'id', 'user', 'fatigue_level', 'fatigue_score', 'confidence',
+            'contributing_factors', 'timestamp_iso'
+        ).order_by('-timestamp')
+        recent = analyses.filter(timestamp__gt=timezone.now() - timedelta(hours=1)).first()
+        
+        if recent:
+            serializer = self.get_serializer(recent)
+            cache.set(key, serializer.data, timeout=CURRENT_FATIGUE_TIMEOUT)
+            return Response(serializer.data)
         
-        if latest:
-            # Check if it's recent (within the last hour)
-            if latest.timestamp > timezone.now() - timedelta(hours=1):
-                serializer = self.get_serializer(latest)
-                return Response(serializer.data)
+        # If no recent analysis, refresh it in the background and return
+        # whatever we already have so the client is never blocked on inference
+        enqueue_fatigue_prediction(request.user.id)
         
-        # If no recent analysis, generate a new one
-        detector = FatigueDetector()
-        analysis = detector.predict(request.user)
+        latest = analyses.first()
+        if latest:
+            serializer = self.get_serializer(latest)
+            return Response(dict(serializer.data, stale=True), status=status.HTTP_202_ACCEPTED)
         
-        # Return the analysis
-        return Response(analysis)
+        return Response({'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
     
     @action(detail=False, methods=['post'])
     def history(self, request):
@@ -169,90 +219,27 @@ class FatigueAnalysisViewSet(viewsets.ModelViewSet):
         end_date = serializer.validated_data['end_date']
         interval = serializer.validated_data['interval']
         
-        # Get fatigue analyses in the date range
-        analyses = FatigueAnalysis.objects.filter(
+        # Group by interval in the database
+        trunc, key_format = HISTORY_BUCKETS[interval]
+        buckets = FatigueAnalysis.objects.filter(
             user=request.user,
             timestamp__gte=start_date,
             timestamp__lte=end_date
-        ).order_by('timestamp')
-        
-        # Group by interval
-        data = []
-        
-        if interval == 'hour':
-            # Group by hour
-            hour_data = {}
-            
-            for analysis in analyses:
-                hour_key = analysis.timestamp.strftime('%Y-%m-%d %H:00')
-                
-                if hour_key not in hour_data:
-                    hour_data[hour_key] = {
-                        'timestamp': hour_key,
-                        'fatigue_scores': [],
-                        'count': 0
-                    }
-                
-                hour_data[hour_key]['fatigue_scores'].append(analysis.fatigue_score)
-                hour_data[hour_key]['count'] += 1
-            
-            # Calculate averages
-            for hour_key, hour_info in hour_data.items():
-                data.append({
-                    'timestamp': hour_key,
-                    'fatigue_score': sum(hour_info['fatigue_scores']) / hour_info['count'],
-                    'count': hour_info['count']
-                })
-        
-        elif interval == 'day':
-            # Group by day
-            day_data = {}
-            
-            for analysis in analyses:
-                day_key = analysis.timestamp.strftime('%Y-%m-%d')
-                
-                if day_key not in day_data:
-                    day_data[day_key] = {
-                        'timestamp': day_key,
-                        'fatigue_scores': [],
-                        'count': 0
-                    }
-                
-                day_data[day_key]['fatigue_scores'].append(analysis.fatigue_score)
-                day_data[day_key]['count'] += 1
-            
-            # Calculate averages
-            for day_key, day_info in day_data.items():
-                data.append({
-                    'timestamp': day_key,
-                    'fatigue_score': sum(day_info['fatigue_scores']) / day_info['count'],
-                    'count': day_info['count']
-                })
-        
-        elif interval == 'week':
-            # Group by week
-            week_data = {}
-            
-            for analysis in analyses:
-                week_key = analysis.timestamp.strftime('%Y-%U')
-                
-                if week_key not in week_data:
-                    week_data[week_key] = {
-                        'timestamp': week_key,
-                        'fatigue_scores': [],
-                        'count': 0
-                    }
-                
-                week_data[week_key]['fatigue_scores'].append(analysis.fatigue_score)
-                week_data[week_key]['count'] += 1
-            
-            # Calculate averages
-            for week_key, week_info in week_data.items():
-                data.append({
-                    'timestamp': week_key,
-                    'fatigue_score': sum(week_info['fatigue_scores']) / week_info['count'],
-                    'count': week_info['count']
-                })
+        ).annotate(
+            bucket=trunc('timestamp')
+        ).values('bucket').annotate(
+            fatigue_score=Avg('fatigue_score'),
+            count=Count('id')
+        ).order_by('bucket')
+        
+        data = [
+            {
+                'timestamp': row['bucket'].strftime(key_format),
+                'fatigue_score': row['fatigue_score'],
+                'count': row['count']
+            }
+            for row in buckets
+        ]
         
         return Response(data)
 
@@ -264,16 +251,16 @@ class ProductivityRecommendationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset to only return the current user's data."""
-        return ProductivityRecommendation.objects.filter(user=self.request.user)
+        return ProductivityRecommendation.objects.filter(user=self.request.user).order_by('-timestamp')
     
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get a current recommendation."""
         # Get the latest fatigue analysis
-        latest_fatigue = FatigueAnalysis.objects.filter(user=request.user).order_by('-timestamp').first()
+        latest_fatigue = get_latest_fatigue(request.user.id)
         
         # Generate a recommendation
-        engine = RecommendationEngine()
+        engine = get_recommender()
         recommendation = engine.get_recommendation(request.user, latest_fatigue)
         
         return Response(recommendation)
@@ -290,27 +277,26 @@ class ProductivityRecommendationViewSet(viewsets.ModelViewSet):
         implemented = serializer.validated_data['implemented']
         effectiveness = serializer.validated_data['effectiveness']
         
-        try:
-            # Get the recommendation
-            recommendation = ProductivityRecommendation.objects.get(id=recommendation_id, user=request.user)
-            
-            # Update the recommendation
-            recommendation.implemented = implemented
-            recommendation.effectiveness = effectiveness
-            recommendation.save()
-            
-            # Update the model if implemented
-            if implemented:
-                engine = RecommendationEngine()
-                engine.update_model(request.user, recommendation_id, effectiveness)
-            
-            return Response({'status': 'success'})
+        # Update the recommendation in a single UPDATE of just these columns
+        updated = ProductivityRecommendation.objects.filter(
+            id=recommendation_id, user=request.user
+        ).update(implemented=implemented, effectiveness=effectiveness)
         
-        except ProductivityRecommendation.DoesNotExist:
+        if not updated:
             return Response(
                 {'error': 'Recommendation not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        
+        # Update the model if implemented
+        if implemented:
+            engine = get_recommender()
+            engine.update_model(request.user, recommendation_id, effectiveness)
+        
+        # Feedback changes what gets recommended next
+        invalidate_user_cache(request.user.id)
+        
+        return Response({'status': 'success'})
 
 class ProductivitySessionViewSet(viewsets.ModelViewSet):
     """API endpoint for productivity sessions."""
@@ -324,7 +310,28 @@ class ProductivitySessionViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Set the user to the current user when creating a new object."""
-        serializer.save(user=self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise ValidationError({'error': 'There is already an active session'})
+    
+    def list(self, request, *args, **kwargs):
+        """Stream the session list so long histories are never buffered in memory."""
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related('recommendations_followed')
+        return StreamingHttpResponse(self._json_stream(queryset), content_type='application/json')
+    
+    def _json_stream(self, queryset):
+        """Yield a JSON array one serialized session at a time."""
+        # Same renderer settings (compact separators, unicode, float handling)
+        # the non-streamed responses get
+        renderer = JSONRenderer()
+        yield b'['
+        for index, session in enumerate(queryset.iterator(chunk_size=200)):
+            if index:
+                yield b','
+            yield renderer.render(self.get_serializer(session).data)
+        yield b']'
     
     @action(detail=False, methods=['get'])
     def current(self, request):
@@ -347,24 +354,20 @@ class ProductivitySessionViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def start(self, request):
         """Start a new productivity session."""
-        # Check if there's already an active session
-        active_session = ProductivitySession.objects.filter(
-            user=request.user,
-            end_time__isnull=True
-        ).exists()
-        
-        if active_session:
+        # The one_active_session constraint rejects a second open session,
+        # even when two start requests race
+        try:
+            with transaction.atomic():
+                session = ProductivitySession.objects.create(
+                    user=request.user,
+                    start_time=timezone.now()
+                )
+        except IntegrityError:
             return Response(
                 {'error': 'There is already an active session'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create a new session
-        session = ProductivitySession.objects.create(
-            user=request.user,
-            start_time=timezone.now()
-        )
-        
         serializer = self.get_serializer(session)
         return Response(serializer.data)
     
@@ -389,19 +392,20 @@ class ProductivitySessionViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 timestamp__gte=session.start_time,
                 timestamp__lte=session.end_time
-            ).order_by('timestamp')
+            )
+            summary = fatigue_analyses.aggregate(avg=Avg('fatigue_score'), n=Count('id'))
             
-            if fatigue_analyses:
-                # Calculate average fatigue score
-                avg_fatigue = sum(a.fatigue_score for a in fatigue_analyses) / len(fatigue_analyses)
-                
-                # Invert fatigue score to get productivity score (simplified)
-                session.productivity_score = 100 - avg_fatigue
+            if summary['n']:
+                # Invert average fatigue score to get productivity score (simplified)
+                session.productivity_score = 100 - summary['avg']
                 
                 # Store fatigue progression
+                progression = list(
+                    fatigue_analyses.order_by('timestamp').values_list('timestamp', 'fatigue_score')
+                )
                 session.fatigue_progression = {
-                    'timestamps': [a.timestamp.isoformat() for a in fatigue_analyses],
-                    'scores': [a.fatigue_score for a in fatigue_analyses]
+                    'timestamps': [timestamp.isoformat() for timestamp, _ in progression],
+                    'scores': [score for _, score in progression]
                 }
             
             session.save()
@@ -415,60 +419,93 @@ class ProductivitySessionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+def _last_recommendation(user):
+    """The user's most recent stored recommendation, shaped like the engine's output."""
+    row = ProductivityRecommendation.objects.filter(user=user).only(
+        'id', 'recommendation_type', 'description', 'duration', 'expected_impact'
+    ).order_by('-timestamp').first()
+    if row is None:
+        return None
+    return {
+        'id': row.id,
+        'type': row.recommendation_type,
+        'description': row.description,
+        'duration': row.duration,
+        'expected_impact': row.expected_impact * 100  # Convert to percentage
+    }
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_data(request):
-    """Get data for the dashboard."""
-    try:
-    # Get the latest fatigue analysis
-    latest_fatigue = FatigueAnalysis.objects.filter(user=request.user).order_by('-timestamp').first()
-    
-        if not latest_fatigue:
-            # If no fatigue analysis exists, create one
-            detector = FatigueDetector()
-            analysis = detector.predict(request.user)
-            latest_fatigue = FatigueAnalysis.objects.filter(user=request.user).order_by('-timestamp').first()
-    
-    # Get recent fatigue history (last 24 hours)
-    recent_fatigue = FatigueAnalysis.objects.filter(
-        user=request.user,
-        timestamp__gte=timezone.now() - timedelta(hours=24)
-    ).order_by('timestamp')
+    """
+    Get data for the dashboard.
     
-    fatigue_history = []
-    for analysis in recent_fatigue:
-        fatigue_history.append({
-            'timestamp': analysis.timestamp.isoformat(),
-            'fatigue_score': analysis.fatigue_score,
-            'fatigue_level': analysis.fatigue_level
-        })
+    ML work never runs on the request thread. While a prediction or a
+    recommendation is being computed in the background the response is a
+    202 with "pending": true, carrying the last known values (current_fatigue
+    is null until the first analysis exists); otherwise it is a 200 with
+    "pending": false.
+    """
+    key = dashboard_key(request.user.id)
+    cached = cache.get(key)
+    if cached is not None:
+        return Response(cached)
     
-    # Get recent recommendations
-        engine = RecommendationEngine()
-        recommendations = engine.get_recommendation(request.user, latest_fatigue)
+    try:
+        # Share one cutoff reference across every filter below
+        now = timezone.now()
+        
+        # Get the latest fatigue analysis
+        latest_fatigue = FatigueAnalysis.objects.filter(user=request.user).only(
+            'fatigue_score', 'fatigue_level', 'timestamp', 'contributing_factors'
+        ).order_by('-timestamp').first()
+        
+        pending = False
+        if not latest_fatigue:
+            # If no fatigue analysis exists, create one in the background
+            enqueue_fatigue_prediction(request.user.id)
+            pending = True
+        
+        # Get recent fatigue history (last 24 hours); this payload has always
+        # used datetime.isoformat(), unlike the DRF-rendered timestamp_iso
+        fatigue_history = [
+            {'timestamp': timestamp.isoformat(), 'fatigue_score': score, 'fatigue_level': level}
+            for timestamp, score, level in FatigueAnalysis.objects.filter(
+                user=request.user,
+                timestamp__gte=now - timedelta(hours=24)
+            ).order_by('timestamp').values_list(
+                'timestamp', 'fatigue_score', 'fatigue_level'
+            ).iterator(chunk_size=2000)
+        ]
+        
+        # Get recent recommendations for the analysis loaded above; on a miss
+        # one is generated in the background and the last stored one is shown
+        recommendations = None
+        if latest_fatigue:
+            recommendations = cache.get(recommendation_key(request.user.id, latest_fatigue.fatigue_level))
+        if recommendations is None:
+            if latest_fatigue:
+                enqueue_recommendation(request.user.id)
+                pending = True
+            recommendations = _last_recommendation(request.user)
         
         # Calculate productivity score based on recent sessions
-        recent_sessions = ProductivitySession.objects.filter(
+        productivity_score = ProductivitySession.objects.filter(
             user=request.user,
             end_time__isnull=False,
-            end_time__gte=timezone.now() - timedelta(hours=24)
-        )
-        
-        productivity_score = 0
-        if recent_sessions.exists():
-            total_score = sum(session.productivity_score for session in recent_sessions)
-            productivity_score = total_score / recent_sessions.count()
+            end_time__gte=now - timedelta(hours=24)
+        ).aggregate(avg=Avg('productivity_score'))['avg'] or 0
         
         # Calculate focus level based on keyboard and mouse metrics
         keyboard_metrics = KeyboardMetrics.objects.filter(
             user=request.user,
-            timestamp__gte=timezone.now() - timedelta(hours=1)
-        ).order_by('-timestamp').first()
+            timestamp__gte=now - timedelta(hours=1)
+        ).only('typing_speed').order_by('-timestamp').first()
         
         mouse_metrics = MouseMetrics.objects.filter(
             user=request.user,
-            timestamp__gte=timezone.now() - timedelta(hours=1)
-        ).order_by('-timestamp').first()
+            timestamp__gte=now - timedelta(hours=1)
+        ).only('movement_speed').order_by('-timestamp').first()
         
         focus_level = 0
         if keyboard_metrics and mouse_metrics:
@@ -479,9 +516,9 @@ def dashboard_data(request):
         
         # Calculate stress level based on facial metrics
         facial_metrics = FacialMetrics.objects.filter(
-        user=request.user,
-            timestamp__gte=timezone.now() - timedelta(hours=1)
-        ).order_by('-timestamp').first()
+            user=request.user,
+            timestamp__gte=now - timedelta(hours=1)
+        ).only('eye_blink_rate', 'facial_expression').order_by('-timestamp').first()
         
         stress_level = 0
         if facial_metrics:
@@ -489,76 +526,89 @@ def dashboard_data(request):
             blink_score = min(facial_metrics.eye_blink_rate / 20, 1) * 50  # Max 50 points
             expression_score = 50 if facial_metrics.facial_expression == 'stressed' else 0
             stress_level = blink_score + expression_score
-    
-    # Compile dashboard data
-    dashboard = {
-        'current_fatigue': {
+        
+        # Compile dashboard data
+        dashboard = {
+            'current_fatigue': {
                 'score': latest_fatigue.fatigue_score,
                 'level': latest_fatigue.fatigue_level,
                 'timestamp': latest_fatigue.timestamp.isoformat(),
                 'contributing_factors': latest_fatigue.contributing_factors
-        },
-            'recent_recommendations': [recommendations],
-        'fatigue_history': fatigue_history,
+            } if latest_fatigue else None,
+            'recent_recommendations': [recommendations] if recommendations else [],
+            'fatigue_history': fatigue_history,
             'productivity_score': round(productivity_score),
             'focus_level': round(focus_level),
-            'stress_level': round(stress_level)
-    }
-    
-    return Response(dashboard)
+            'stress_level': round(stress_level),
+            'pending': pending
+        }
+        
+        if pending:
+            # Not cached, so the next poll picks up the background result
+            return Response(dashboard, status=status.HTTP_202_ACCEPTED)
         
+        cache.set(key, dashboard, timeout=DASHBOARD_TIMEOUT)
+        return Response(dashboard)
+    
     except Exception as e:
         return Response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+def _after_ingest(user_ids):
+    """Refresh derived data once a user's buffered metrics are written."""
+    for user_id in user_ids:
+        # New metrics make the cached dashboard stale
+        invalidate_user_cache(user_id)
+        enqueue_fatigue_prediction(user_id)
+
+# Posted snapshots are written in batches every couple of seconds
+_ingest_buffer = IngestBuffer(flush_interval=2.0, on_flush=_after_ingest)
+
+# Posted modality key and the metrics model its snapshots become
+_SNAPSHOT_MODELS = (
+    ('typing', KeyboardMetrics),
+    ('mouse', MouseMetrics),
+    ('facial', FacialMetrics)
+)
+
+def _as_batch(value):
+    """Normalize a posted snapshot or list of snapshots to a list."""
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def data_collection(request):
     """Handle collected data from the data collection page."""
     try:
-        data = request.data
-        
-        # Save keyboard metrics
-        if data.get('typing'):
-            typing_data = data['typing']
-            KeyboardMetrics.objects.create(
-                user=request.user,
-                typing_speed=typing_data.get('typingSpeed', 0),
-                error_rate=typing_data.get('errorRate', 0),
-                pause_frequency=typing_data.get('pauseFrequency', 0),
-                key_press_duration=typing_data.get('keyPressDuration', 0),
-                timestamp=timezone.now()
-            )
-        
-        # Save mouse metrics
-        if data.get('mouse'):
-            mouse_data = data['mouse']
-            MouseMetrics.objects.create(
-                user=request.user,
-                movement_speed=mouse_data.get('movementSpeed', 0),
-                click_frequency=mouse_data.get('clickFrequency', 0),
-                movement_pattern=mouse_data.get('movementPattern', {}),
-                timestamp=timezone.now()
-            )
-        
-        # Save facial metrics
-        if data.get('facial'):
-            facial_data = data['facial']
-            FacialMetrics.objects.create(
-                user=request.user,
-                eye_blink_rate=facial_data.get('blinkRate', 0),
-                eye_closure_duration=facial_data.get('eyeClosure', 0),
-                facial_expression=facial_data.get('expression', 'neutral'),
-                timestamp=timezone.now()
-            )
-        
-        # Generate fatigue analysis
-        detector = FatigueDetector()
-        analysis = detector.predict(request.user)
-        
-        return Response({'status': 'success'})
+        # Each modality may be a single snapshot or a batch of snapshots;
+        # bad values are rejected here because the write happens after the 202
+        query = DataCollectionSerializer(data={
+            name: _as_batch(request.data.get(name)) for name, _ in _SNAPSHOT_MODELS
+        })
+        if not query.is_valid():
+            return Response({
+                'status': 'error',
+                'message': 'Invalid collected data',
+                'errors': query.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        snapshots = query.validated_data
+        now = timezone.now()
+        rows = [
+            model(user=request.user, timestamp=now, **snapshot)
+            for name, model in _SNAPSHOT_MODELS
+            for snapshot in snapshots[name]
+        ]
+        
+        # Queue the rows for the next batched write; the fatigue analysis is
+        # refreshed in the background once they are stored
+        _ingest_buffer.add(request.user.id, rows)
+        
+        return Response({'status': 'success'}, status=status.HTTP_202_ACCEPTED)
         
     except Exception as e:
         return Response(
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FatiqueConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fatique'
+
+    def ready(self):
+        from . import checks  # noqa: F401  Registers the system checks
@@ -0,0 +1,73 @@
+"""
+Per-user cache keys for the polled API responses.
+"""
+
+from django.core.cache import cache
+from .models import FatigueAnalysis
+
+# The dashboard only changes when new metrics arrive (every collection
+# interval), so a short TTL absorbs repeated client polls
+DASHBOARD_TIMEOUT = 30
+
+# Matches how long the "current" analysis is considered fresh enough to reuse
+CURRENT_FATIGUE_TIMEOUT = 60
+
+# Newest score/level per user; every write of an analysis invalidates it
+LATEST_FATIGUE_TIMEOUT = 30
+
+# Recommendations depend only on the fatigue level between polls; new
+# analyses, metrics and feedback drop them through invalidate_user_cache
+RECOMMENDATION_TIMEOUT = 30
+
+
+def dashboard_key(user_id):
+    """Cache key for a user's serialized dashboard."""
+    return f'dash:{user_id}'
+
+
+def current_fatigue_key(user_id):
+    """Cache key for a user's serialized current fatigue analysis."""
+    return f'fatigue:current:{user_id}'
+
+
+def latest_fatigue_key(user_id):
+    """Cache key for a user's latest fatigue score and level."""
+    return f'fatigue:latest:{user_id}'
+
+
+def recommendation_key(user_id, fatigue_level):
+    """Cache key for the recommendation shown at a given fatigue level."""
+    return f'rec:{user_id}:{fatigue_level}'
+
+
+def invalidate_user_cache(user_id):
+    """Drop every cached response that depends on a user's latest data."""
+    cache.delete_many([
+        dashboard_key(user_id),
+        current_fatigue_key(user_id),
+        latest_fatigue_key(user_id),
+        # One recommendation per level; the levels are a fixed choice list
+        *(recommendation_key(user_id, level) for level, _ in FatigueAnalysis.FATIGUE_LEVEL_CHOICES)
+    ])
+
+
+def get_latest_fatigue(user_id):
+    """
+    Latest fatigue analysis for a user, read through the cache.
+
+    Returns:
+        Unsaved FatigueAnalysis carrying only fatigue_score and
+        fatigue_level, or None if the user has no analyses yet
+    """
+    key = latest_fatigue_key(user_id)
+    latest = cache.get(key)
+    if latest is None:
+        latest = FatigueAnalysis.objects.filter(user_id=user_id).order_by(
+            '-timestamp'
+        ).values_list('fatigue_score', 'fatigue_level').first()
+        if latest is None:
+            return None
+        cache.set(key, latest, timeout=LATEST_FATIGUE_TIMEOUT)
+
+    fatigue_score, fatigue_level = latest
+    return FatigueAnalysis(user_id=user_id, fatigue_score=fatigue_score, fatigue_level=fatigue_level)
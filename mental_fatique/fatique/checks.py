@@ -0,0 +1,33 @@
+"""
+System checks for invariants of the fatique app's code.
+"""
+
+import os
+import re
+from django.core import checks
+
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), 'datasets')
+
+# Per-row pandas iteration; dataset features must stay vectorized
+ROW_ITERATION_RE = re.compile(r'\.(iterrows|itertuples)\(')
+
+
+@checks.register()
+def check_no_row_iteration(app_configs, **kwargs):
+    """Flag per-row pandas iteration in the datasets package."""
+    errors = []
+    for name in sorted(os.listdir(DATASETS_DIR)):
+        if not name.endswith('.py'):
+            continue
+        path = os.path.join(DATASETS_DIR, name)
+        with open(path, encoding='utf-8') as f:
+            for lineno, line in enumerate(f, 1):
+                match = ROW_ITERATION_RE.search(line)
+                if match:
+                    errors.append(checks.Warning(
+                        f"DataFrame.{match.group(1)}() in fatique/datasets/{name}:{lineno}",
+                        hint='Derive dataset features with vectorized column expressions instead.',
+                        obj=path,
+                        id='fatique.W001',
+                    ))
+    return errors
@@ -0,0 +1,65 @@
+"""
+Preallocated sample buffers shared by the trackers and analyzers.
+"""
+
+import numpy as np
+
+
+class SampleBuffer:
+    """
+    Preallocated ring buffer holding samples column by column.
+    
+    Once full, new samples overwrite the oldest ones. Meant for a single
+    producer thread: the producer only advances count and a single consumer
+    only advances the read cursor through drain(), so neither side locks.
+    """
+    
+    def __init__(self, capacity, **columns):
+        """
+        Args:
+            capacity: Maximum number of samples kept
+            columns: Column name -> dtype, or (dtype, per-sample shape)
+        """
+        self.capacity = capacity
+        self.columns = {}
+        for name, spec in columns.items():
+            dtype, shape = spec if isinstance(spec, tuple) else (spec, ())
+            self.columns[name] = np.empty((capacity,) + shape, dtype=dtype)
+        self.count = 0  # Samples appended since the last clear
+        self.read = 0  # Samples already handed out by drain()
+    
+    def __len__(self):
+        return min(self.count - self.read, self.capacity)
+    
+    def append(self, **values):
+        """Write one sample into the next slot."""
+        index = self.count % self.capacity
+        for name, value in values.items():
+            self.columns[name][index] = value
+        self.count += 1
+    
+    def snapshot(self):
+        """
+        Return every column's unread samples in insertion order.
+        
+        The sample count is read once, so all columns line up even while a
+        producer keeps appending; append() fills the slot before counting it.
+        """
+        return self._copy(self.read, self.count)
+    
+    def drain(self):
+        """Return the unread samples like snapshot() and mark them as read."""
+        count = self.count
+        samples = self._copy(self.read, count)
+        self.read = count
+        return samples
+    
+    def _copy(self, start, stop):
+        # Samples already overwritten by the producer are gone; the rest are
+        # copied out so later appends cannot change what the caller holds
+        start = max(start, stop - self.capacity)
+        slots = np.arange(start, stop) % self.capacity
+        return {name: column[slots] for name, column in self.columns.items()}
+    
+    def clear(self):
+        self.count = self.read = 0
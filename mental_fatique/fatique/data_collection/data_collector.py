@@ -6,10 +6,59 @@ from .keyboard_tracker import KeyboardTracker
 from .mouse_tracker import MouseTracker
 from .facial_analyzer import FacialAnalyzer
 from .voice_analyzer import VoiceAnalyzer
+from .storage import database_writer
+from concurrent.futures import ThreadPoolExecutor, wait
+import sched
 import threading
 import time
 
+class SaveScheduler:
+    """Single background thread that fires the periodic saves of every collector."""
+    
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._scheduler = sched.scheduler(time.monotonic, self._delay)
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def _delay(self, timeout):
+        # Sleep until the next event is due, or until a new event is scheduled
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+    
+    def schedule(self, delay, action):
+        """Run action after delay seconds; returns a handle for cancel()."""
+        event = self._scheduler.enter(delay, 1, action)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        self._wakeup.set()
+        return event
+    
+    def cancel(self, event):
+        """Cancel a scheduled event if it has not fired yet."""
+        try:
+            self._scheduler.cancel(event)
+        except ValueError:
+            pass
+        self._wakeup.set()
+    
+    def _run(self):
+        while True:
+            self._scheduler.run()
+            with self._lock:
+                if self._scheduler.empty():
+                    self._thread = None
+                    return
+
 class DataCollector:
+    # Shared by every collector: one scheduler thread for the periodic saves
+    # and a small pool that builds the independent trackers' rows in parallel
+    _save_scheduler = SaveScheduler()
+    _save_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='collector-save')
+    
     def __init__(self, user, collection_interval=60, save_interval=300):
         """
         Initialize the data collector.
@@ -32,7 +81,7 @@ class DataCollector:
         # Threading
         self.is_collecting = False
         self.collection_thread = None
-        self.save_thread = None
+        self.save_event = None
     
     def start_collection(self):
         """Start collecting data from all sources."""
@@ -45,10 +94,8 @@ class DataCollector:
             self.facial_analyzer.start_analyzing()
             self.voice_analyzer.start_analyzing()
             
-            # Start save thread
-            self.save_thread = threading.Thread(target=self._save_loop)
-            self.save_thread.daemon = True
-            self.save_thread.start()
+            # Schedule the first periodic save
+            self.save_event = self._save_scheduler.schedule(self.save_interval, self._scheduled_save)
             
             print("Data collection started")
     
@@ -63,32 +110,51 @@ class DataCollector:
             self.facial_analyzer.stop_analyzing()
             self.voice_analyzer.stop_analyzing()
             
+            # Cancel the pending periodic save
+            if self.save_event:
+                self._save_scheduler.cancel(self.save_event)
+                self.save_event = None
+            
             # Save final data
             self._save_data()
             
-            # Wait for save thread to finish
-            if self.save_thread:
-                self.save_thread.join(timeout=1.0)
-            
             print("Data collection stopped")
     
     def _save_data(self):
         """Save data from all trackers to the database."""
-        self.keyboard_tracker.save_data()
-        self.mouse_tracker.save_data()
-        self.facial_analyzer.save_data()
-        self.voice_analyzer.save_data()
-        print("Data saved to database")
+        # Build each tracker's rows in parallel, then commit them together
+        futures = [
+            self._save_executor.submit(tracker.collect_records)
+            for tracker in (
+                self.keyboard_tracker,
+                self.mouse_tracker,
+                self.facial_analyzer,
+                self.voice_analyzer
+            )
+        ]
+        wait(futures)
+        
+        records = []
+        for future in futures:
+            if future.exception():
+                print(f"Error collecting data: {future.exception()}")
+            else:
+                records.extend(future.result())
+        
+        database_writer.submit(records)
+        print("Data queued for saving")
     
-    def _save_loop(self):
-        """Periodically save data to the database."""
-        while self.is_collecting:
-            # Sleep for the save interval
-            time.sleep(self.save_interval)
-            
-            # Save data if still collecting
+    def _scheduled_save(self):
+        """Save data and schedule the next periodic save."""
+        if not self.is_collecting:
+            return
+        
+        try:
+            self._save_data()
+        finally:
+            # Reschedule if still collecting
             if self.is_collecting:
-                self._save_data()
+                self.save_event = self._save_scheduler.schedule(self.save_interval, self._scheduled_save)
     
     def get_current_metrics(self):
         """Get the current metrics from all trackers."""
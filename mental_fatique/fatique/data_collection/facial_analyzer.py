@@ -4,14 +4,149 @@ Captures facial expressions, eye movements, and calculates metrics.
 """
 
 import cv2
+import math
 import numpy as np
 import time
 import threading
+import dlib
 import face_recognition
+from face_recognition.api import pose_predictor_68_point
+import os
+import re
 from django.utils import timezone
 from ..models import BehavioralData, FacialMetrics
+from .buffers import SampleBuffer
+from .storage import database_writer
 import json
 
+# Optional JIT for the per-frame landmark math; plain Python otherwise
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Optional OpenCV SSD face detector; HOG is used when these files are absent
+FACE_NET_DIR = os.path.join(os.path.dirname(__file__), 'face_detector')
+FACE_NET_CONFIG = os.path.join(FACE_NET_DIR, 'deploy.prototxt')
+FACE_NET_WEIGHTS = os.path.join(FACE_NET_DIR, 'res10_300x300_ssd_iter_140000.caffemodel')
+
+def load_face_net():
+    """
+    Load the SSD face detector, on CUDA when OpenCV was built with it.
+    
+    Returns:
+        cv2.dnn.Net, or None if the model files are missing or fail to load
+    """
+    if not (os.path.exists(FACE_NET_CONFIG) and os.path.exists(FACE_NET_WEIGHTS)):
+        return None
+    
+    try:
+        net = cv2.dnn.readNetFromCaffe(FACE_NET_CONFIG, FACE_NET_WEIGHTS)
+        if hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+            net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+            net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+        return net
+    except cv2.error as e:
+        print(f"❌ Error loading face detector, falling back to HOG: {e}")
+        return None
+
+# V4L2 camera pipeline that hands OpenCV BGR frames with no queued backlog
+GSTREAMER_PIPELINE = (
+    'v4l2src device={device} ! video/x-raw,width=640,height=480,framerate={fps}/1 '
+    '! videoconvert ! video/x-raw,format=BGR ! appsink drop=true max-buffers=1'
+)
+
+def open_camera(camera_id, fps):
+    """
+    Open a camera, through GStreamer when OpenCV was built with it.
+    
+    Returns:
+        cv2.VideoCapture for the camera
+    """
+    device = f'/dev/video{camera_id}'
+    if os.path.exists(device) and re.search(r'GStreamer:\s*YES', cv2.getBuildInformation()):
+        cap = cv2.VideoCapture(GSTREAMER_PIPELINE.format(device=device, fps=fps), cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            return cap
+        cap.release()
+    
+    cap = cv2.VideoCapture(camera_id)
+    # Only keep the newest frame so a slow iteration never works on a backlog
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    return cap
+
+# Indices into dlib's 68-point landmark layout
+LEFT_EYE, RIGHT_EYE = 36, 42  # First of each eye's six points
+MOUTH_LEFT, MOUTH_RIGHT = 48, 54  # Outer lip corners
+UPPER_LIP_TOP, LOWER_LIP_BOTTOM = 51, 57  # Outer lip midpoints
+NOSE_TIP = 31
+CHIN = 0  # First jawline point, as face_recognition's 'chin' feature
+
+# Expression labels stored as int8 codes in the frame buffer
+EXPRESSIONS = ('neutral', 'smiling', 'surprised')
+NEUTRAL, SMILING, SURPRISED = range(len(EXPRESSIONS))
+
+@njit(cache=True, fastmath=True)
+def _eye_aspect_ratio(pts, start):
+    """EAR of the six eye points starting at pts[start]; scale-invariant."""
+    # Vertical distances between the eyelid points
+    a = math.hypot(pts[start + 1, 0] - pts[start + 5, 0], pts[start + 1, 1] - pts[start + 5, 1])
+    b = math.hypot(pts[start + 2, 0] - pts[start + 4, 0], pts[start + 2, 1] - pts[start + 4, 1])
+    
+    # Horizontal distance between the eye corners
+    c = math.hypot(pts[start, 0] - pts[start + 3, 0], pts[start, 1] - pts[start + 3, 1])
+    if c == 0:
+        # Degenerate landmarks (coinciding corners); 0.0 in both builds
+        # instead of inf/NaN under numba and ZeroDivisionError without it
+        return 0.0
+    return (a + b) / (2.0 * c)
+
+@njit(cache=True, fastmath=True)
+def frame_kernel(pts, scale):
+    """
+    Compute one frame's features from its 68 landmarks in a single pass.
+    
+    Args:
+        pts: int32 array of shape (68, 2) in detection-frame pixels
+        scale: Detection-frame size relative to the full frame
+        
+    Returns:
+        Tuple of (ear, expression code, (nose_x, nose_y), (chin_x, chin_y)),
+        with positions in full-frame pixels
+    """
+    # Average eye aspect ratio; blinks are found later from the stored series
+    ear = (_eye_aspect_ratio(pts, LEFT_EYE) + _eye_aspect_ratio(pts, RIGHT_EYE)) / 2.0
+    
+    # Mouth width and height, squared and in full-frame pixels
+    dx = (pts[MOUTH_LEFT, 0] - pts[MOUTH_RIGHT, 0]) / scale
+    dy = (pts[MOUTH_LEFT, 1] - pts[MOUTH_RIGHT, 1]) / scale
+    mouth_width_sq = dx * dx + dy * dy
+    dx = (pts[UPPER_LIP_TOP, 0] - pts[LOWER_LIP_BOTTOM, 0]) / scale
+    dy = (pts[UPPER_LIP_TOP, 1] - pts[LOWER_LIP_BOTTOM, 1]) / scale
+    mouth_height_sq = dx * dx + dy * dy
+    
+    # Simple expression detection based on mouth shape; squared distances
+    # against squared thresholds (60, 20 and 30 px)
+    expression = NEUTRAL
+    if mouth_width_sq > 3600 and mouth_height_sq < 400:
+        expression = SMILING
+    elif mouth_height_sq > 900:
+        expression = SURPRISED
+    
+    # Head position
+    nose = (int(pts[NOSE_TIP, 0] / scale), int(pts[NOSE_TIP, 1] / scale))
+    chin = (int(pts[CHIN, 0] / scale), int(pts[CHIN, 1] / scale))
+    return ear, expression, nose, chin
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from the on-disk cache) at import, not on the first frame
+    frame_kernel(np.arange(136, dtype=np.int32).reshape(68, 2), 0.25)
+
 class FacialAnalyzer:
     def __init__(self, user, camera_id=0):
         self.user = user
@@ -19,128 +154,188 @@ class FacialAnalyzer:
         self.cap = None
         self.is_analyzing = False
         self.thread = None
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # Guards sample appends and the buffer swap
+        
+        # Capture rate; fatigue metrics do not need the camera's full 30 fps
+        self.TARGET_FPS = 15
+        
+        # Facial data storage, one column per value; sized for several
+        # minutes of frames between saves
+        self.FRAME_BUFFER_SIZE = 8192
+        self.frames = self._new_frame_buffer()
         
-        # Facial data storage
-        self.blinks = []
-        self.eye_aspects = []  # Eye aspect ratios over time
-        self.facial_expressions = []
-        self.head_positions = []
+        # Spare swapped in at each save, so the analysis thread only waits
+        # for the swap itself, never for a save
+        self._spare_frames = self._new_frame_buffer()
         
         # Blink detection parameters
         self.EYE_AR_THRESH = 0.2  # Eye aspect ratio threshold for blink detection
-        self.EYE_AR_CONSEC_FRAMES = 3  # Number of consecutive frames for blink
-        self.blink_counter = 0
-        self.last_blink_time = None
-        
-    def eye_aspect_ratio(self, eye_landmarks):
-        """Calculate the eye aspect ratio (EAR) for blink detection."""
-        # Compute the euclidean distances between the vertical eye landmarks
-        A = np.linalg.norm(eye_landmarks[1] - eye_landmarks[5])
-        B = np.linalg.norm(eye_landmarks[2] - eye_landmarks[4])
-        
-        # Compute the euclidean distance between the horizontal eye landmarks
-        C = np.linalg.norm(eye_landmarks[0] - eye_landmarks[3])
-        
-        # Compute the eye aspect ratio
-        ear = (A + B) / (2.0 * C)
-        return ear
+        self.EYE_AR_CONSEC_FRAMES = 2  # Consecutive frames for a blink (~130 ms at 15 fps)
+        
+        # Face detection runs on a downscaled frame; HOG cost scales with pixel count
+        self.FRAME_SCALE = 0.25
+        self.DETECTION_UPSAMPLE = 1  # Recovers small faces lost by the downscale
+        
+        # Detection reuse: the face barely moves between frames at a desk
+        self.DETECT_EVERY_N_FRAMES = 3  # Re-detect a moving face at most this often
+        self.MOTION_THRESHOLD = 2.0  # Mean abs pixel diff that counts as movement
+        self.LOCATION_MAX_AGE = 0.5  # Seconds before a cached location is re-detected
+        self.frame_index = 0
+        self.prev_small_gray = None
+        self.face_location = None
+        self.face_location_time = 0
+        
+        # Face detector: SSD-MobileNet when available, otherwise dlib HOG
+        # (or dlib's CNN in batches on a GPU)
+        self.face_net = load_face_net()
+        self.FACE_NET_CONFIDENCE = 0.5
+        
+        # With a CUDA build of dlib, detect several frames per GPU call instead
+        self.use_batch_detection = self.face_net is None and dlib.DLIB_USE_CUDA
+        self.DETECTION_BATCH_SIZE = 8  # ~0.5 s of frames at 15 fps
+        
+    def _new_frame_buffer(self):
+        return SampleBuffer(
+            self.FRAME_BUFFER_SIZE,
+            timestamp=np.float64,
+            ear=np.float32,  # Eye aspect ratio
+            expression=np.int8,  # Index into EXPRESSIONS
+            head=(np.int16, (4,))  # nose_tip_x, nose_tip_y, chin_x, chin_y
+        )
     
-    def detect_blink(self, ear):
-        """Detect blinks based on eye aspect ratio."""
-        if ear < self.EYE_AR_THRESH:
-            self.blink_counter += 1
-        else:
-            # If we had enough consecutive frames with low EAR, count as blink
-            if self.blink_counter >= self.EYE_AR_CONSEC_FRAMES:
-                current_time = time.time()
-                
-                # Record blink
-                blink_data = {
-                    'timestamp': current_time,
-                    'duration': self.blink_counter / 30.0  # Assuming 30 fps
-                }
-                
-                self.blinks.append(blink_data)
-                
-                # Update last blink time
-                self.last_blink_time = current_time
-                
-            # Reset counter
-            self.blink_counter = 0
+    def detect_blinks(self, frames):
+        """
+        Find blinks in a frame snapshot in one vectorized pass over the EAR series.
+        
+        A blink is a run of at least EYE_AR_CONSEC_FRAMES frames below
+        EYE_AR_THRESH that has ended; it is timed at the first open frame.
+        
+        Returns:
+            Tuple of (blink timestamps, blink durations in seconds) arrays
+        """
+        closed = (frames['ear'] < self.EYE_AR_THRESH).astype(np.int8)
+        # Leading 0 so a run open at the start still has a rising edge; no
+        # trailing 0, so a run still open at the end is not counted yet
+        edges = np.diff(closed, prepend=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts[:len(ends)]
+        
+        blinks = lengths >= self.EYE_AR_CONSEC_FRAMES
+        return frames['timestamp'][ends[blinks]], lengths[blinks] / self.TARGET_FPS
+    
+    def _locate_face(self, small_frame, small_gray):
+        """
+        Return the face location list for a downscaled frame.
+        
+        The HOG detection is skipped while the frame is nearly unchanged and
+        the last location is still fresh; landmarks are always recomputed, so
+        blinks are still seen on the reused location.
+        """
+        self.frame_index += 1
+        prev_gray, self.prev_small_gray = self.prev_small_gray, small_gray
+        
+        now = time.time()
+        fresh = (
+            self.face_location is not None and
+            now - self.face_location_time < self.LOCATION_MAX_AGE
+        )
+        
+        if fresh:
+            moved = (
+                prev_gray is not None and
+                np.mean(cv2.absdiff(small_gray, prev_gray)) >= self.MOTION_THRESHOLD
+            )
+            if not moved or self.frame_index % self.DETECT_EVERY_N_FRAMES:
+                return [self.face_location]
+        
+        face_locations = self._detect_faces(small_frame, small_gray)
+        
+        self.face_location = face_locations[0] if face_locations else None
+        self.face_location_time = now
+        return face_locations[:1]
+    
+    def _detect_faces(self, small_frame, small_gray):
+        """Detect faces in a downscaled frame as (top, right, bottom, left) boxes."""
+        if self.face_net is None:
+            return face_recognition.face_locations(
+                small_gray,
+                number_of_times_to_upsample=self.DETECTION_UPSAMPLE,
+                model='hog'
+            )
+        
+        height, width = small_frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(
+            cv2.resize(small_frame, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0)
+        )
+        self.face_net.setInput(blob)
+        detections = self.face_net.forward()[0, 0]
+        
+        # Rows are [_, _, confidence, x1, y1, x2, y2] with coordinates in 0..1
+        face_locations = []
+        for detection in detections[detections[:, 2] >= self.FACE_NET_CONFIDENCE]:
+            left = max(int(detection[3] * width), 0)
+            top = max(int(detection[4] * height), 0)
+            right = min(int(detection[5] * width), width - 1)
+            bottom = min(int(detection[6] * height), height - 1)
+            if right > left and bottom > top:
+                face_locations.append((top, right, bottom, left))
+        
+        return face_locations
+    
+    def _shrink(self, frame):
+        """Return the downscaled BGR frame and its grayscale plane."""
+        # Detect on a small copy of the frame; HOG and the landmark predictor
+        # only need luminance, so one grayscale plane replaces an RGB copy
+        small_frame = cv2.resize(frame, (0, 0), fx=self.FRAME_SCALE, fy=self.FRAME_SCALE)
+        small_gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+        return small_frame, small_gray
     
     def analyze_frame(self, frame):
         """Analyze a single frame for facial features."""
-        # Convert to RGB for face_recognition
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        small_frame, small_gray = self._shrink(frame)
         
         # Find face locations and landmarks
-        face_locations = face_recognition.face_locations(rgb_frame)
-        
+        face_locations = self._locate_face(small_frame, small_gray)
+        return self._analyze_face(small_gray, face_locations, time.time())
+    
+    def _analyze_batch(self, batch):
+        """
+        Detect faces for a batch of (timestamp, small frame, gray) tuples in
+        one GPU call, then analyze each frame in capture order.
+        """
+        batch_locations = face_recognition.batch_face_locations(
+            [cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB) for _, small_frame, _ in batch],
+            number_of_times_to_upsample=self.DETECTION_UPSAMPLE,
+            batch_size=len(batch)
+        )
+        for (timestamp, _, small_gray), face_locations in zip(batch, batch_locations):
+            self._analyze_face(small_gray, face_locations[:1], timestamp)
+    
+    def _analyze_face(self, small_gray, face_locations, timestamp):
+        """Extract and store facial features for a frame's detected face."""
         if face_locations:
-            # Get the first face
-            face_landmarks = face_recognition.face_landmarks(rgb_frame, face_locations)[0]
-            
-            # Get timestamp
-            timestamp = time.time()
-            
-            # Extract eye landmarks
-            left_eye = np.array([face_landmarks['left_eye']])
-            right_eye = np.array([face_landmarks['right_eye']])
-            
-            # Calculate eye aspect ratios
-            left_ear = self.eye_aspect_ratio(left_eye[0])
-            right_ear = self.eye_aspect_ratio(right_eye[0])
+            # Run the shared 68-point predictor on the first face directly,
+            # skipping face_recognition's per-call dict building
+            top, right, bottom, left = face_locations[0]
+            shape = pose_predictor_68_point(small_gray, dlib.rectangle(left, top, right, bottom))
+            pts = np.array([(part.x, part.y) for part in shape.parts()], dtype=np.int32)
             
-            # Average the eye aspect ratio
-            ear = (left_ear + right_ear) / 2.0
+            # EAR, expression and head position in one compiled pass; the
+            # kernel scales back to full-frame pixels so thresholds keep
+            # their meaning. In a real application, you would use more
+            # sophisticated models
+            ear, expression, nose_tip, chin = frame_kernel(pts, self.FRAME_SCALE)
             
-            # Detect blink
-            self.detect_blink(ear)
-            
-            # Store eye aspect ratio
-            self.eye_aspects.append({
-                'timestamp': timestamp,
-                'ear': ear
-            })
-            
-            # Analyze facial expression (simplified)
-            # In a real application, you would use a more sophisticated model
-            mouth_width = np.linalg.norm(
-                np.array(face_landmarks['top_lip'][0]) - 
-                np.array(face_landmarks['top_lip'][6])
-            )
-            mouth_height = np.linalg.norm(
-                np.array(face_landmarks['top_lip'][3]) - 
-                np.array(face_landmarks['bottom_lip'][3])
-            )
-            
-            # Simple expression detection based on mouth shape
-            expression = 'neutral'
-            if mouth_width > 60 and mouth_height < 20:
-                expression = 'smiling'
-            elif mouth_height > 30:
-                expression = 'surprised'
-            
-            self.facial_expressions.append({
-                'timestamp': timestamp,
-                'expression': expression
-            })
-            
-            # Extract head position (simplified)
-            # In a real application, you would use a more sophisticated model
-            nose_tip = np.array(face_landmarks['nose_tip'][0])
-            chin = np.array(face_landmarks['chin'][0])
-            
-            head_position = {
-                'timestamp': timestamp,
-                'nose_tip_x': int(nose_tip[0]),
-                'nose_tip_y': int(nose_tip[1]),
-                'chin_x': int(chin[0]),
-                'chin_y': int(chin[1])
-            }
-            
-            self.head_positions.append(head_position)
+            # Store this frame's sample; the lock keeps a concurrent save
+            # from swapping the buffer out mid-append
+            with self.lock:
+                self.frames.append(
+                    timestamp=timestamp,
+                    ear=ear,
+                    expression=expression,
+                    head=(nose_tip[0], nose_tip[1], chin[0], chin[1])
+                )
             
             return True
         
@@ -148,20 +343,42 @@ class FacialAnalyzer:
     
     def analyze_video(self):
         """Continuously analyze video frames."""
-        self.cap = cv2.VideoCapture(self.camera_id)
+        self.cap = open_camera(self.camera_id, self.TARGET_FPS)
+        
+        frame_interval = 1.0 / self.TARGET_FPS
+        next_deadline = time.perf_counter()
+        batch = []
+        frame = None
         
         while self.is_analyzing:
-            ret, frame = self.cap.read()
+            # Decode into the previous frame's array; only the shrunk copies
+            # outlive an iteration
+            ret, frame = self.cap.read(frame)
             
             if not ret:
                 print("Failed to grab frame")
                 break
             
-            with self.lock:
+            # Analysis runs unlocked; only the sample append takes the lock
+            if self.use_batch_detection:
+                batch.append((time.time(),) + self._shrink(frame))
+                if len(batch) >= self.DETECTION_BATCH_SIZE:
+                    self._analyze_batch(batch)
+                    batch = []
+            else:
                 self.analyze_frame(frame)
             
-            # Add a small delay to reduce CPU usage
-            time.sleep(0.03)  # ~30 fps
+            # Sleep only for what is left of this frame's time slot
+            next_deadline += frame_interval
+            delay = next_deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Running behind; restart pacing instead of bursting to catch up
+                next_deadline = time.perf_counter()
+        
+        if batch:
+            self._analyze_batch(batch)
         
         # Release the camera
         if self.cap:
@@ -186,95 +403,111 @@ class FacialAnalyzer:
     
     def calculate_metrics(self):
         """Calculate facial metrics from collected data."""
-        with self.lock:
-            # Check if we have enough data
-            if not self.eye_aspects or not self.facial_expressions:
-                return None
-            
-            # Calculate blink rate (blinks per minute)
-            if len(self.blinks) < 2:
-                blink_rate = 0
-            else:
-                first_blink = self.blinks[0]['timestamp']
-                last_blink = self.blinks[-1]['timestamp']
-                duration_minutes = (last_blink - first_blink) / 60
-                blink_rate = len(self.blinks) / max(duration_minutes, 0.016)
-            
-            # Calculate average eye closure duration
-            if self.blinks:
-                eye_closure_durations = [blink['duration'] * 1000 for blink in self.blinks]  # Convert to ms
-                eye_closure_duration = np.mean(eye_closure_durations)
-            else:
-                eye_closure_duration = 0
-            
-            # Determine dominant facial expression
-            if self.facial_expressions:
-                expressions = [expr['expression'] for expr in self.facial_expressions]
-                expression_counts = {}
-                for expr in expressions:
-                    expression_counts[expr] = expression_counts.get(expr, 0) + 1
-                
-                dominant_expression = max(expression_counts, key=expression_counts.get)
-            else:
-                dominant_expression = 'unknown'
-            
-            # Extract head position data
-            if self.head_positions:
-                head_position_data = {
-                    'average_nose_tip_x': np.mean([pos['nose_tip_x'] for pos in self.head_positions]),
-                    'average_nose_tip_y': np.mean([pos['nose_tip_y'] for pos in self.head_positions]),
-                    'movement_variance_x': np.var([pos['nose_tip_x'] for pos in self.head_positions]),
-                    'movement_variance_y': np.var([pos['nose_tip_y'] for pos in self.head_positions])
-                }
-            else:
-                head_position_data = {
-                    'average_nose_tip_x': 0,
-                    'average_nose_tip_y': 0,
-                    'movement_variance_x': 0,
-                    'movement_variance_y': 0
-                }
-            
-            return {
-                'eye_blink_rate': blink_rate,
-                'eye_closure_duration': eye_closure_duration,
-                'facial_expression': dominant_expression,
-                'head_position': head_position_data
-            }
+        frames = self.frames.snapshot()
+        return self._metrics_from(frames, self.detect_blinks(frames))
     
-    def save_data(self):
-        """Save the collected data and metrics to the database."""
+    def _metrics_from(self, frames, blinks):
+        """Calculate facial metrics from a frame snapshot and its blinks."""
+        # Check if we have enough data
+        if not len(frames['timestamp']):
+            return None
+        
+        # Calculate blink rate (blinks per minute)
+        blink_times, blink_durations = blinks
+        if len(blink_times) < 2:
+            blink_rate = 0
+        else:
+            duration_minutes = (blink_times[-1] - blink_times[0]) / 60
+            blink_rate = len(blink_times) / max(duration_minutes, 0.016)
+        
+        # Calculate average eye closure duration
+        if len(blink_durations):
+            eye_closure_duration = float(blink_durations.mean()) * 1000  # Convert to ms
+        else:
+            eye_closure_duration = 0
+        
+        # Determine dominant facial expression
+        expression_counts = np.bincount(frames['expression'], minlength=len(EXPRESSIONS))
+        dominant_expression = EXPRESSIONS[int(expression_counts.argmax())]
+        
+        # Extract head position data
+        nose_tip = frames['head'][:, :2]
+        mean_x, mean_y = nose_tip.mean(axis=0)
+        var_x, var_y = nose_tip.var(axis=0)
+        head_position_data = {
+            'average_nose_tip_x': float(mean_x),
+            'average_nose_tip_y': float(mean_y),
+            'movement_variance_x': float(var_x),
+            'movement_variance_y': float(var_y)
+        }
+        
+        return {
+            'eye_blink_rate': blink_rate,
+            'eye_closure_duration': eye_closure_duration,
+            'facial_expression': dominant_expression,
+            'head_position': head_position_data
+        }
+    
+    def collect_records(self):
+        """
+        Build unsaved rows for the collected data and metrics, then reset.
+
+        Returns:
+            List of unsaved BehavioralData and FacialMetrics instances
+        """
+        # Swap in empty buffers; once the lock is released the analysis
+        # thread can no longer append to the full ones read below
         with self.lock:
-            # Save raw data
-            raw_data = {
-                'blinks': self.blinks,
-                'eye_aspects': self.eye_aspects,
-                'facial_expressions': self.facial_expressions,
-                'head_positions': self.head_positions
-            }
-            
-            BehavioralData.objects.create(
+            frame_buffer, self.frames = self.frames, self._spare_frames or self._new_frame_buffer()
+            self._spare_frames = None  # Checked out until recycled below
+        
+        frames = frame_buffer.snapshot()
+        blinks = self.detect_blinks(frames)
+        
+        # Raw samples go into a compressed columnar blob; raw_data keeps a
+        # small summary instead of one JSON object per frame
+        raw_blob = BehavioralData.pack_arrays(
+            frame_timestamp=frames['timestamp'],
+            ear=frames['ear'],
+            expression=frames['expression'],
+            expression_labels=np.array(EXPRESSIONS),
+            head=frames['head'],  # nose_tip_x, nose_tip_y, chin_x, chin_y
+            blink_timestamp=blinks[0],
+            blink_duration=blinks[1]
+        )
+        raw_data = {
+            'format': 'npz',
+            'frames': len(frames['timestamp']),
+            'blinks': len(blinks[0])
+        }
+        
+        records = [BehavioralData(
+            user=self.user,
+            data_type='facial',
+            raw_data=raw_data,
+            raw_blob=raw_blob,
+            timestamp=timezone.now()
+        )]
+        
+        # Calculate metrics
+        metrics = self._metrics_from(frames, blinks)
+        if metrics:
+            records.append(FacialMetrics(
                 user=self.user,
-                data_type='facial',
-                raw_data=raw_data,
+                eye_blink_rate=metrics['eye_blink_rate'],
+                eye_closure_duration=metrics['eye_closure_duration'],
+                facial_expression=metrics['facial_expression'],
+                head_position=metrics['head_position'],
                 timestamp=timezone.now()
-            )
-            
-            # Calculate and save metrics
-            metrics = self.calculate_metrics()
-            if metrics:
-                FacialMetrics.objects.create(
-                    user=self.user,
-                    eye_blink_rate=metrics['eye_blink_rate'],
-                    eye_closure_duration=metrics['eye_closure_duration'],
-                    facial_expression=metrics['facial_expression'],
-                    head_position=metrics['head_position'],
-                    timestamp=timezone.now()
-                )
-            
-            # Reset data
-            self.blinks = []
-            self.eye_aspects = []
-            self.facial_expressions = []
-            self.head_positions = []
-            self.blink_counter = 0
-            self.last_blink_time = None
+            ))
+        
+        # Recycle the drained buffer as the next spare
+        frame_buffer.clear()
+        with self.lock:
+            self._spare_frames = frame_buffer
+        
+        return records
+    
+    def save_data(self):
+        """Queue the collected data and metrics for the database writer."""
+        database_writer.submit(self.collect_records())
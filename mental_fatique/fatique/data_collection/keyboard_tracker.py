@@ -7,59 +7,74 @@ import time
 from pynput import keyboard
 from django.utils import timezone
 from ..models import BehavioralData, KeyboardMetrics
+from .buffers import SampleBuffer
+from .storage import database_writer
 import json
 import threading
 import numpy as np
 
+# Keystrokes kept between saves; ~20 minutes of fast (400 KPM) typing
+KEY_BUFFER_SIZE = 8192
+
+def key_code(key):
+    """
+    Map a pynput key to an int32 code: its virtual key code when known,
+    otherwise a hash of its name (stable within one process only).
+    """
+    vk = getattr(key, 'vk', None)
+    if vk is None:
+        # Special keys (Key.shift, ...) carry their KeyCode as the enum value
+        vk = getattr(getattr(key, 'value', None), 'vk', None)
+    if vk is None:
+        vk = hash(str(key)) & 0x7fffffff
+    return vk
+
+# Backspace releases count as error corrections
+BACKSPACE = key_code(keyboard.Key.backspace)
+
 class KeyboardTracker:
     def __init__(self, user):
         self.user = user
-        self.key_presses = []
-        self.key_releases = []
-        self.key_press_times = {}  # Key: key, Value: press time
-        self.errors = 0
-        self.total_keys = 0
+        # Written only by pynput's listener thread, which fires callbacks
+        # one at a time, so the callbacks take no lock; savers drain them
+        self.presses = self._new_press_buffer()
+        self.releases = self._new_release_buffer()
+        self.key_press_times = {}  # Key: key code, Value: press time
         self.is_tracking = False
         self.listener = None
-        self.lock = threading.Lock()
-        
+        self.lock = threading.Lock()  # Only serializes savers draining the buffers
+    
+    def _new_press_buffer(self):
+        return SampleBuffer(KEY_BUFFER_SIZE, timestamp=np.float64, key=np.int32)
+    
+    def _new_release_buffer(self):
+        return SampleBuffer(
+            KEY_BUFFER_SIZE,
+            timestamp=np.float64,
+            key=np.int32,
+            duration=np.float32  # Seconds held; NaN when the press was missed
+        )
+    
     def on_press(self, key):
         """Callback function for key press events."""
         try:
-            with self.lock:
-                timestamp = time.time()
-                key_char = key.char if hasattr(key, 'char') else str(key)
-                self.key_press_times[key_char] = timestamp
-                self.key_presses.append({
-                    'key': key_char,
-                    'timestamp': timestamp
-                })
-                self.total_keys += 1
+            timestamp = time.time()
+            code = key_code(key)
+            self.key_press_times[code] = timestamp
+            self.presses.append(timestamp=timestamp, key=code)
         except Exception as e:
             print(f"Error in on_press: {e}")
     
     def on_release(self, key):
         """Callback function for key release events."""
         try:
-            with self.lock:
-                timestamp = time.time()
-                key_char = key.char if hasattr(key, 'char') else str(key)
-                
-                # Calculate key press duration if we have the press time
-                duration = None
-                if key_char in self.key_press_times:
-                    duration = timestamp - self.key_press_times[key_char]
-                    del self.key_press_times[key_char]
-                
-                self.key_releases.append({
-                    'key': key_char,
-                    'timestamp': timestamp,
-                    'duration': duration
-                })
-                
-                # Check for backspace as a potential error correction
-                if key == keyboard.Key.backspace:
-                    self.errors += 1
+            timestamp = time.time()
+            code = key_code(key)
+            
+            # Calculate key press duration if we have the press time
+            press_time = self.key_press_times.pop(code, None)
+            duration = np.nan if press_time is None else timestamp - press_time
+            self.releases.append(timestamp=timestamp, key=code, duration=duration)
         except Exception as e:
             print(f"Error in on_release: {e}")
     
@@ -83,76 +98,101 @@ class KeyboardTracker:
     
     def calculate_metrics(self):
         """Calculate keyboard metrics from collected data."""
-        with self.lock:
-            # Calculate typing speed (keys per minute)
-            if not self.key_presses:
-                return None
-            
-            first_press = self.key_presses[0]['timestamp']
-            last_press = self.key_presses[-1]['timestamp']
-            
-            # Avoid division by zero
-            if last_press == first_press:
-                typing_duration_minutes = 0.016  # Assume 1 second if same timestamp
-            else:
-                typing_duration_minutes = (last_press - first_press) / 60
-            
-            typing_speed = self.total_keys / max(typing_duration_minutes, 0.016)
-            
-            # Calculate error rate
-            error_rate = (self.errors / max(self.total_keys, 1)) * 100
-            
-            # Calculate pause frequency (pauses per minute)
-            pauses = 0
-            for i in range(1, len(self.key_presses)):
-                time_diff = self.key_presses[i]['timestamp'] - self.key_presses[i-1]['timestamp']
-                if time_diff > 1.0:  # Pause defined as > 1 second between keypresses
-                    pauses += 1
-            
-            pause_frequency = pauses / max(typing_duration_minutes, 0.016)
-            
-            # Calculate average key press duration
-            durations = [release['duration'] for release in self.key_releases if release['duration'] is not None]
-            key_press_duration = np.mean(durations) * 1000 if durations else 0  # Convert to milliseconds
-            
-            return {
-                'typing_speed': typing_speed,
-                'error_rate': error_rate,
-                'pause_frequency': pause_frequency,
-                'key_press_duration': key_press_duration
-            }
+        return self._metrics_from(self.presses.snapshot(), self.releases.snapshot())
     
-    def save_data(self):
-        """Save the collected data and metrics to the database."""
+    def _metrics_from(self, presses, releases):
+        """Calculate keyboard metrics from press and release buffer snapshots."""
+        # Calculate typing speed (keys per minute)
+        press_times = presses['timestamp']
+        total_keys = len(press_times)
+        if not total_keys:
+            return None
+        
+        first_press = press_times[0]
+        last_press = press_times[-1]
+        
+        # Avoid division by zero
+        if last_press == first_press:
+            typing_duration_minutes = 0.016  # Assume 1 second if same timestamp
+        else:
+            typing_duration_minutes = (last_press - first_press) / 60
+        
+        typing_speed = total_keys / max(typing_duration_minutes, 0.016)
+        
+        # Calculate error rate from backspaces as potential error corrections
+        errors = int(np.count_nonzero(releases['key'] == BACKSPACE))
+        error_rate = (errors / max(total_keys, 1)) * 100
+        
+        # Calculate pause frequency (pauses per minute)
+        # Pause defined as > 1 second between keypresses
+        pauses = int(np.count_nonzero(np.diff(press_times) > 1.0))
+        
+        pause_frequency = pauses / max(typing_duration_minutes, 0.016)
+        
+        # Calculate average key press duration
+        # (NaN marks releases whose press was missed)
+        durations = releases['duration']
+        if np.isnan(durations).all():
+            key_press_duration = 0
+        else:
+            key_press_duration = float(np.nanmean(durations, dtype=np.float64)) * 1000  # Convert to milliseconds
+        
+        return {
+            'typing_speed': typing_speed,
+            'error_rate': error_rate,
+            'pause_frequency': pause_frequency,
+            'key_press_duration': key_press_duration
+        }
+    
+    def collect_records(self):
+        """
+        Build unsaved rows for the collected data and metrics, then reset.
+
+        Returns:
+            List of unsaved BehavioralData and KeyboardMetrics instances
+        """
+        # Copy out everything unread; the listener keeps appending to the
+        # same rings behind the read cursor without waiting
         with self.lock:
-            # Save raw data
-            raw_data = {
-                'key_presses': self.key_presses,
-                'key_releases': self.key_releases
-            }
-            
-            BehavioralData.objects.create(
+            presses = self.presses.drain()
+            releases = self.releases.drain()
+        
+        # Raw samples go in the compressed blob; raw_data keeps a summary
+        raw_blob = BehavioralData.pack_arrays(
+            press_timestamp=presses['timestamp'],
+            press_key=presses['key'],
+            release_timestamp=releases['timestamp'],
+            release_key=releases['key'],
+            release_duration=releases['duration']
+        )
+        raw_data = {
+            'format': 'npz',
+            'presses': len(presses['timestamp']),
+            'releases': len(releases['timestamp'])
+        }
+        
+        records = [BehavioralData(
+            user=self.user,
+            data_type='keyboard',
+            raw_data=raw_data,
+            raw_blob=raw_blob,
+            timestamp=timezone.now()
+        )]
+        
+        # Calculate metrics
+        metrics = self._metrics_from(presses, releases)
+        if metrics:
+            records.append(KeyboardMetrics(
                 user=self.user,
-                data_type='keyboard',
-                raw_data=raw_data,
+                typing_speed=metrics['typing_speed'],
+                error_rate=metrics['error_rate'],
+                pause_frequency=metrics['pause_frequency'],
+                key_press_duration=metrics['key_press_duration'],
                 timestamp=timezone.now()
-            )
-            
-            # Calculate and save metrics
-            metrics = self.calculate_metrics()
-            if metrics:
-                KeyboardMetrics.objects.create(
-                    user=self.user,
-                    typing_speed=metrics['typing_speed'],
-                    error_rate=metrics['error_rate'],
-                    pause_frequency=metrics['pause_frequency'],
-                    key_press_duration=metrics['key_press_duration'],
-                    timestamp=timezone.now()
-                )
-            
-            # Reset data
-            self.key_presses = []
-            self.key_releases = []
-            self.key_press_times = {}
-            self.errors = 0
-            self.total_keys = 0
+            ))
+        
+        return records
+    
+    def save_data(self):
+        """Queue the collected data and metrics for the database writer."""
+        database_writer.submit(self.collect_records())
@@ -7,6 +7,7 @@ import time
 from pynput import mouse
 from django.utils import timezone
 from ..models import BehavioralData, MouseMetrics
+from .storage import database_writer
 import json
 import threading
 import numpy as np
@@ -19,7 +20,7 @@ class MouseTracker:
         self.clicks = []
         self.is_tracking = False
         self.listener = None
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()  # Re-entered by calculate_metrics during collect_records
         self.last_position = None
         self.last_timestamp = None
     
@@ -155,35 +156,46 @@ class MouseTracker:
                 'movement_pattern': movement_pattern
             }
     
-    def save_data(self):
-        """Save the collected data and metrics to the database."""
+    def collect_records(self):
+        """
+        Build unsaved rows for the collected data and metrics, then reset.
+
+        Returns:
+            List of unsaved BehavioralData and MouseMetrics instances
+        """
         with self.lock:
-            # Save raw data
+            # Raw data
             raw_data = {
                 'movements': self.movements,
                 'clicks': self.clicks
             }
             
-            BehavioralData.objects.create(
+            records = [BehavioralData(
                 user=self.user,
                 data_type='mouse',
                 raw_data=raw_data,
                 timestamp=timezone.now()
-            )
+            )]
             
-            # Calculate and save metrics
+            # Calculate metrics
             metrics = self.calculate_metrics()
             if metrics:
-                MouseMetrics.objects.create(
+                records.append(MouseMetrics(
                     user=self.user,
                     movement_speed=metrics['movement_speed'],
                     click_frequency=metrics['click_frequency'],
                     movement_pattern=metrics['movement_pattern'],
                     timestamp=timezone.now()
-                )
+                ))
             
             # Reset data
             self.movements = []
             self.clicks = []
             self.last_position = None
             self.last_timestamp = None
+            
+            return records
+    
+    def save_data(self):
+        """Queue the collected data and metrics for the database writer."""
+        database_writer.submit(self.collect_records())
@@ -0,0 +1,160 @@
+"""
+Batched persistence for rows produced by the trackers, analyzers and the
+data collection API.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+def save_records(records, batch_size=None):
+    """
+    Insert unsaved model instances with one bulk_create per model.
+
+    All inserts share a single transaction, so a save cycle commits once
+    no matter how many trackers contributed rows.
+
+    Args:
+        records: Iterable of unsaved model instances, possibly of mixed types
+        batch_size: Maximum number of rows per INSERT statement (defaults to
+            settings.FATIGUE_BULK_BATCH_SIZE)
+    """
+    by_model = {}
+    for record in records:
+        by_model.setdefault(type(record), []).append(record)
+
+    if not by_model:
+        return
+
+    batch_size = batch_size or settings.FATIGUE_BULK_BATCH_SIZE
+    with transaction.atomic():
+        for model, rows in by_model.items():
+            model.objects.bulk_create(rows, batch_size=batch_size)
+
+
+class DatabaseWriter:
+    """
+    Single background thread that performs every queued save_records() call.
+
+    Producers only build unsaved rows; JSON encoding of raw payloads and the
+    INSERTs happen here, off the tracking and scheduling threads.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.join)
+
+    def submit(self, records):
+        """Queue a list of unsaved model instances to be written."""
+        if not records:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='db-writer')
+                self._thread.daemon = True
+                self._thread.start()
+        self._queue.put(records)
+
+    def join(self):
+        """Block until everything queued so far has been written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            records = self._queue.get()
+            close_old_connections()
+            try:
+                save_records(records)
+            except Exception as e:
+                print(f"❌ Error writing collected data: {e}")
+            finally:
+                self._queue.task_done()
+
+
+database_writer = DatabaseWriter()
+
+
+class IngestBuffer:
+    """
+    Accumulate posted rows in memory and write them in periodic batches.
+
+    Frequent small uploads are coalesced into one save_records() call per
+    flush interval instead of one transaction per request. Callers validate
+    rows before adding them; a batch that still fails is retried one user at
+    a time so one user's rows cannot roll back another's.
+
+    Rows are held in process memory until the flush. A graceful shutdown
+    writes them through atexit, but a crash or SIGKILL loses up to one
+    flush interval of accepted uploads.
+    """
+
+    def __init__(self, flush_interval=2.0, on_flush=None):
+        """
+        Args:
+            flush_interval: Seconds to wait after the first buffered row before writing
+            on_flush: Optional callable receiving the set of user ids just written
+        """
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self._records = {}  # Key: user id, Value: list of unsaved rows
+        self._timer = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def add(self, user_id, records):
+        """Buffer unsaved rows for a user and schedule a flush if none is pending."""
+        if not records:
+            return
+        with self._lock:
+            self._records.setdefault(user_id, []).extend(records)
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write everything buffered so far."""
+        with self._lock:
+            pending, self._records = self._records, {}
+            self._timer = None
+
+        if not pending:
+            return
+
+        all_records = [record for records in pending.values() for record in records]
+        if self._save(all_records, "Batched ingest write failed; retrying %d users one at a time", len(pending)):
+            written = set(pending)
+        else:
+            written = {
+                user_id for user_id, records in pending.items()
+                if self._save(records, "Dropping %d ingested rows for user %s", len(records), user_id)
+            }
+
+        if written and self.on_flush:
+            self.on_flush(written)
+
+    def _save(self, records, message, *args):
+        """save_records() that logs the failure and reports whether it committed."""
+        try:
+            save_records(records)
+        except Exception:
+            logger.exception(message, *args)
+            return False
+        return True
+
+    def _flush_in_thread(self):
+        # Timer threads are short-lived, so do not leave their connection open
+        close_old_connections()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Error flushing ingested data")
+        finally:
+            connection.close()
@@ -11,6 +11,7 @@ import time
 import queue
 from django.utils import timezone
 from ..models import BehavioralData, VoiceMetrics
+from .storage import database_writer
 
 class VoiceAnalyzer:
     def __init__(self, user, sample_rate=16000, duration=5):
@@ -19,7 +20,7 @@ class VoiceAnalyzer:
         self.duration = duration  # Recording duration in seconds
         self.is_analyzing = False
         self.thread = None
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()  # Re-entered by calculate_metrics during collect_records
         self.audio_queue = queue.Queue()
         
         # Voice data storage
@@ -187,34 +188,45 @@ class VoiceAnalyzer:
                 'clarity': clarity
             }
     
-    def save_data(self):
-        """Save the collected data and metrics to the database."""
+    def collect_records(self):
+        """
+        Build unsaved rows for the collected data and metrics, then reset.
+
+        Returns:
+            List of unsaved BehavioralData and VoiceMetrics instances
+        """
         with self.lock:
-            # Save raw data
+            # Raw data
             raw_data = {
                 'recordings': self.recordings,
                 'speech_features': self.speech_features
             }
             
-            BehavioralData.objects.create(
+            records = [BehavioralData(
                 user=self.user,
                 data_type='voice',
                 raw_data=raw_data,
                 timestamp=timezone.now()
-            )
+            )]
             
-            # Calculate and save metrics
+            # Calculate metrics
             metrics = self.calculate_metrics()
             if metrics:
-                VoiceMetrics.objects.create(
+                records.append(VoiceMetrics(
                     user=self.user,
                     speech_rate=metrics['speech_rate'],
                     pitch_variation=metrics['pitch_variation'],
                     volume=metrics['volume'],
                     clarity=metrics['clarity'],
                     timestamp=timezone.now()
-                )
+                ))
             
             # Reset data
             self.recordings = []
             self.speech_features = []
+            
+            return records
+    
+    def save_data(self):
+        """Queue the collected data and metrics for the database writer."""
+        database_writer.submit(self.collect_records())
@@ -1,16 +1,22 @@
 """
 Enhanced Data integrator for combining facial, mouse, and keyboard datasets.
 Processes real datasets provided by the user.
+
+No per-row pandas iteration: all feature derivations are vectorized NumPy
+column expressions. `manage.py check` flags any iterrows()/itertuples() in
+this package (fatique.W001).
 """
 
 import os
 import pandas as pd
 import numpy as np
-import glob
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from django.conf import settings
-from .dataset_loader import DatasetLoader
+from .dataset_loader import CSV_ENGINE, DatasetLoader
 
 # Optional imports for image processing
 try:
@@ -25,13 +31,154 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+# Optional JIT for scoring very large keystroke CSVs
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _keyboard_fatigue_kernel(speed, error, pause, duration, out):
+        """Fused, multithreaded version of the keyboard fatigue formula."""
+        for i in prange(speed.shape[0]):
+            speed_factor = max(0.0, (50.0 - speed[i]) / 50.0)
+            error_factor = min(1.0, error[i] / 10.0)
+            pause_factor = min(1.0, pause[i] / 7.0)
+            duration_factor = min(1.0, (duration[i] - 80.0) / 120.0)
+            score = 0.3 * speed_factor + 0.3 * error_factor + 0.2 * pause_factor + 0.2 * duration_factor
+            out[i] = min(max(score, 0.0), 1.0)
+
+# Typed columns of the keystroke dynamics CSV; any others are inferred
+KEYBOARD_DTYPES = {
+    'typing_speed': 'float32',
+    'error_rate': 'float32',
+    'pause_frequency': 'float32',
+    'key_press_duration': 'float32',
+}
+
+# Weights of the speed, error, pause and duration factors in keyboard fatigue
+KEYBOARD_FATIGUE_WEIGHTS = np.array([0.3, 0.3, 0.2, 0.2], dtype=np.float32)
+
+def keyboard_fatigue_scores(df):
+    """
+    Score each keystroke sample's fatigue from its typing patterns.
+
+    Args:
+        df: DataFrame with typing_speed, error_rate, pause_frequency and
+            key_press_duration columns
+
+    Returns:
+        float32 array of fatigue scores (0-1 scale)
+    """
+    speed = df['typing_speed'].to_numpy(np.float32, copy=False)
+    error = df['error_rate'].to_numpy(np.float32, copy=False)
+    pause = df['pause_frequency'].to_numpy(np.float32, copy=False)
+    duration = df['key_press_duration'].to_numpy(np.float32, copy=False)
+
+    if NUMBA_AVAILABLE:
+        out = np.empty(len(df), dtype=np.float32)
+        _keyboard_fatigue_kernel(speed, error, pause, duration, out)
+        return out
+
+    # One row per factor, computed and clamped in place
+    factors = np.empty((4, len(df)), dtype=np.float32)
+    speed_factor, error_factor, pause_factor, duration_factor = factors
+    np.subtract(50, speed, out=speed_factor)  # Lower speed = higher fatigue
+    speed_factor /= 50
+    np.maximum(speed_factor, 0, out=speed_factor)
+    np.divide(error, 10, out=error_factor)  # Higher errors = higher fatigue
+    np.minimum(error_factor, 1, out=error_factor)
+    np.divide(pause, 7, out=pause_factor)  # More pauses = higher fatigue
+    np.minimum(pause_factor, 1, out=pause_factor)
+    np.subtract(duration, 80, out=duration_factor)  # Longer press = higher fatigue
+    duration_factor /= 120
+    np.minimum(duration_factor, 1, out=duration_factor)
+
+    # Weighted combination (0-1 scale) in one pass over the factors
+    fatigue_score = np.einsum('f,fn->n', KEYBOARD_FATIGUE_WEIGHTS, factors)
+    return np.clip(fatigue_score, 0, 1, out=fatigue_score)
+
+# Session length in IOGraphica filenames, e.g. "12 minutes" or "1.5 hours"
+DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)\s+(minute|hour)s?', re.IGNORECASE)
+
+# Fixed categories for the low-cardinality label columns, so frames built
+# separately stay categorical when concatenated
+LABEL_DTYPES = {
+    'activity_type': pd.CategoricalDtype(['Browsing_Normal', 'Stressed', 'Rest']),
+    'eye_state': pd.CategoricalDtype(['Open', 'Closed']),
+    'yawn_state': pd.CategoricalDtype(['yawn', 'no_yawn']),
+    'data_split': pd.CategoricalDtype(['train', 'test']),
+    'category': pd.CategoricalDtype(['eye_state', 'yawn_detection']),
+}
+
+def with_label_dtypes(df):
+    """Cast whichever label columns a DataFrame has to their categorical dtype."""
+    return df.astype({column: dtype for column, dtype in LABEL_DTYPES.items() if column in df.columns})
+
+def list_images(directory, extensions):
+    """
+    List the image file names in a directory with one os.scandir pass.
+
+    Args:
+        directory: Directory to scan
+        extensions: Lowercase file extensions to keep, e.g. ('.jpg', '.jpeg')
+
+    Returns:
+        List of base names (empty if the directory is missing)
+    """
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as entries:
+        return [
+            entry.name for entry in entries
+            # Skip hidden files, as glob('*.jpg') did
+            if not entry.name.startswith('.')
+            and entry.name.lower().endswith(extensions)
+            and entry.is_file()
+        ]
+
+def list_files(directories, extensions, max_workers=8):
+    """
+    List image file names in several directories concurrently.
+
+    Directory scans are I/O-bound and release the GIL, so independent
+    directories are enumerated on a thread pool.
+
+    Args:
+        directories: Directory paths to scan
+        extensions: Lowercase file extensions to keep, e.g. ('.png',)
+        max_workers: Maximum number of concurrent scans
+
+    Returns:
+        Dictionary mapping each directory to its image base names
+        (empty for missing directories)
+    """
+    directories = list(directories)
+    if not directories:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(directories))) as executor:
+        listings = executor.map(list_images, directories, [extensions] * len(directories))
+        return dict(zip(directories, listings))
+
 class DataIntegrator:
     def __init__(self):
         self.base_dir = settings.BASE_DIR
         self.facial_dir = os.path.join(self.base_dir, 'facial_data')
         self.mouse_dir = os.path.join(self.base_dir, 'mouse_data')
         self.keyboard_dir = os.path.join(self.base_dir, 'keyboard_data')
+        self.data_dir = Path(self.base_dir, 'fatique', 'datasets', 'data')
+        self.integrated_path = self.data_dir / 'integrated_dataset.csv'
+        self.default_path = self.data_dir / 'default.csv'
         self.dataset_loader = DatasetLoader()
+        self._cache = {}  # loader name -> (source mtimes, loaded DataFrame)
+
+        # Seeded generators for the simulated metrics, drawn per directory;
+        # one per loader so concurrent loads stay reproducible
+        mouse_seed, facial_seed = np.random.SeedSequence(42).spawn(2)
+        self._mouse_rng = np.random.default_rng(mouse_seed)
+        self._facial_rng = np.random.default_rng(facial_seed)
 
         # Dataset statistics for normalization
         self.dataset_stats = {
@@ -52,30 +199,41 @@ class DataIntegrator:
             }
         }
 
+    def _cached(self, name, paths, load):
+        """
+        Return load()'s DataFrame, reusing it until one of paths changes.
+
+        Directory mtimes change when files are added or removed, so image
+        folders can be tracked the same way as the keyboard CSV.
+        """
+        stamp = tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        df = load()
+        self._cache[name] = (stamp, df)
+        return df
+
     def load_keyboard_data(self):
-        """Load and preprocess real keyboard data from CSV file."""
+        """
+        Load and preprocess real keyboard data from CSV file.
+
+        The result is cached until the CSV changes; treat it as read-only.
+        """
         keyboard_file = os.path.join(self.keyboard_dir, 'keystroke_dynamics_dataset.csv')
+        return self._cached('keyboard', [keyboard_file], lambda: self._load_keyboard_data(keyboard_file))
 
+    def _load_keyboard_data(self, keyboard_file):
+        """Read the keyboard CSV and score each sample."""
         try:
             if os.path.exists(keyboard_file):
-                df = pd.read_csv(keyboard_file)
+                # Multithreaded PyArrow read with the numeric columns typed up front
+                df = pd.read_csv(keyboard_file, engine=CSV_ENGINE, dtype=KEYBOARD_DTYPES)
                 print(f"✅ Loaded keyboard dataset with {len(df)} samples")
 
                 # Calculate fatigue scores based on typing patterns
-                fatigue_scores = []
-                for _, row in df.iterrows():
-                    # Calculate fatigue based on multiple factors
-                    speed_factor = max(0, (50 - row['typing_speed']) / 50)  # Lower speed = higher fatigue
-                    error_factor = min(1, row['error_rate'] / 10)  # Higher errors = higher fatigue
-                    pause_factor = min(1, row['pause_frequency'] / 7)  # More pauses = higher fatigue
-                    duration_factor = min(1, (row['key_press_duration'] - 80) / 120)  # Longer press = higher fatigue
-
-                    # Weighted combination (0-1 scale)
-                    fatigue_score = (speed_factor * 0.3 + error_factor * 0.3 +
-                                   pause_factor * 0.2 + duration_factor * 0.2)
-                    fatigue_scores.append(min(max(fatigue_score, 0), 1))
-
-                df['fatigue_score'] = fatigue_scores
+                df['fatigue_score'] = keyboard_fatigue_scores(df)
 
                 # Return the full dataset for training
                 return df
@@ -97,47 +255,43 @@ class DataIntegrator:
             'fatigue_score': [0.5]
         })
 
+    # Per-activity base fatigue and (mean, std) of the simulated mouse metrics
+    MOUSE_ACTIVITY_PROFILES = {
+        'Browsing_Normal': {'base_fatigue': 0.3, 'movement_speed': (120, 20), 'click_frequency': (8, 2)},
+        'Stressed': {'base_fatigue': 0.8, 'movement_speed': (180, 30), 'click_frequency': (15, 4)},  # Faster, more erratic, more clicks
+        'Rest': {'base_fatigue': 0.1, 'movement_speed': (60, 15), 'click_frequency': (3, 1)},  # Slower, fewer clicks
+    }
+
     def load_mouse_data(self):
-        """Load and preprocess real mouse data from IOGraphica images."""
+        """
+        Load and preprocess real mouse data from IOGraphica images.
+
+        The result is cached until an activity folder changes; treat it as
+        read-only.
+        """
+        train_dir = os.path.join(self.mouse_dir, 'Train')
+        activity_dirs = [os.path.join(train_dir, activity_type) for activity_type in self.MOUSE_ACTIVITY_PROFILES]
+        return self._cached('mouse', [train_dir] + activity_dirs, lambda: self._load_mouse_data(train_dir))
+
+    def _load_mouse_data(self, train_dir):
+        """Build the mouse dataset from the session images under train_dir."""
         try:
-            mouse_data = []
+            frames = []
 
             # Process training data
-            train_dir = os.path.join(self.mouse_dir, 'Train')
             if os.path.exists(train_dir):
-                for activity_type in ['Browsing_Normal', 'Stressed', 'Rest']:
-                    activity_dir = os.path.join(train_dir, activity_type)
-                    if os.path.exists(activity_dir):
-                        png_files = glob.glob(os.path.join(activity_dir, '*.png'))
-
-                        for png_file in png_files:
-                            # Extract session duration from filename
-                            filename = os.path.basename(png_file)
-                            duration = self._extract_duration_from_filename(filename)
-
-                            # Calculate fatigue score based on activity type and duration
-                            if activity_type == 'Browsing_Normal':
-                                base_fatigue = 0.3
-                            elif activity_type == 'Stressed':
-                                base_fatigue = 0.8
-                            else:  # Rest
-                                base_fatigue = 0.1
-
-                            # Adjust fatigue based on session duration (longer sessions = more fatigue)
-                            duration_factor = min(1.0, duration / 60)  # Normalize to 1 hour
-                            fatigue_score = min(1.0, base_fatigue + (duration_factor * 0.3))
-
-                            mouse_data.append({
-                                'activity_type': activity_type,
-                                'session_duration': duration,
-                                'movement_speed': self._estimate_movement_speed(activity_type),
-                                'click_frequency': self._estimate_click_frequency(activity_type),
-                                'fatigue_score': fatigue_score,
-                                'filename': filename
-                            })
-
-                print(f"✅ Loaded mouse dataset with {len(mouse_data)} sessions")
-                return pd.DataFrame(mouse_data)
+                activity_types = list(self.MOUSE_ACTIVITY_PROFILES)
+                activity_files = list_files(
+                    [os.path.join(train_dir, activity_type) for activity_type in activity_types],
+                    ('.png',)
+                )
+                for activity_type, filenames in zip(activity_types, activity_files.values()):
+                    if filenames:
+                        frames.append(self._build_mouse_frame(activity_type, filenames))
+
+                mouse_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                print(f"✅ Loaded mouse dataset with {len(mouse_df)} sessions")
+                return mouse_df
             else:
                 print(f"❌ Mouse data directory not found: {train_dir}")
                 return self._get_default_mouse_data()
@@ -146,46 +300,60 @@ class DataIntegrator:
             print(f"❌ Error loading mouse data: {e}")
             return self._get_default_mouse_data()
 
+    def _build_mouse_frame(self, activity_type, filenames):
+        """Build the mouse samples for one activity's session images at once."""
+        # Extract session durations from the filenames
+        durations = self._extract_durations(filenames)
+
+        # Calculate fatigue score based on activity type and duration
+        # (longer sessions = more fatigue, normalized to 1 hour)
+        base_fatigue = self.MOUSE_ACTIVITY_PROFILES[activity_type]['base_fatigue']
+        fatigue_scores = durations / 60
+        np.minimum(fatigue_scores, 1.0, out=fatigue_scores)
+        fatigue_scores *= 0.3
+        fatigue_scores += base_fatigue
+        np.clip(fatigue_scores, 0.0, 1.0, out=fatigue_scores)
+
+        movement_speeds, click_frequencies = self._estimate_mouse_metrics(activity_type, len(filenames))
+        return with_label_dtypes(pd.DataFrame({
+            'activity_type': activity_type,
+            'session_duration': durations,
+            'movement_speed': movement_speeds,
+            'click_frequency': click_frequencies,
+            'fatigue_score': fatigue_scores,
+            'filename': filenames
+        }))
+
     def _extract_duration_from_filename(self, filename):
         """Extract session duration in minutes from IOGraphica filename."""
-        try:
-            # Parse filenames like "IOGraphica - 12 minutes (from 22-34 to 22-47).png"
-            if 'minute' in filename:
-                parts = filename.split(' ')
-                for i, part in enumerate(parts):
-                    if 'minute' in part and i > 0:
-                        duration_str = parts[i-1]
-                        if duration_str.replace('.', '').isdigit():
-                            return float(duration_str)
-            elif 'hour' in filename:
-                # Handle hour-based durations
-                parts = filename.split(' ')
-                for i, part in enumerate(parts):
-                    if 'hour' in part and i > 0:
-                        duration_str = parts[i-1]
-                        if duration_str.replace('.', '').isdigit():
-                            return float(duration_str) * 60  # Convert to minutes
-            return 15  # Default duration
-        except:
-            return 15  # Default duration
-
-    def _estimate_movement_speed(self, activity_type):
-        """Estimate mouse movement speed based on activity type."""
-        if activity_type == 'Browsing_Normal':
-            return np.random.normal(120, 20)
-        elif activity_type == 'Stressed':
-            return np.random.normal(180, 30)  # Faster, more erratic
-        else:  # Rest
-            return np.random.normal(60, 15)   # Slower
-
-    def _estimate_click_frequency(self, activity_type):
-        """Estimate click frequency based on activity type."""
-        if activity_type == 'Browsing_Normal':
-            return np.random.normal(8, 2)
-        elif activity_type == 'Stressed':
-            return np.random.normal(15, 4)  # More clicks when stressed
-        else:  # Rest
-            return np.random.normal(3, 1)   # Fewer clicks during rest
+        # Parse filenames like "IOGraphica - 12 minutes (from 22-34 to 22-47).png"
+        match = DURATION_RE.search(filename)
+        if not match:
+            return 15.0  # Default duration
+        duration = float(match.group(1))
+        if match.group(2).lower() == 'hour':
+            return duration * 60  # Convert to minutes
+        return duration
+
+    def _extract_durations(self, filenames):
+        """Extract session durations in minutes for many filenames as an array."""
+        return np.fromiter(
+            (self._extract_duration_from_filename(filename) for filename in filenames),
+            dtype=np.float64,
+            count=len(filenames)
+        )
+
+    def _estimate_mouse_metrics(self, activity_type, size):
+        """
+        Estimate mouse movement speeds and click frequencies for an activity.
+
+        Returns:
+            Tuple of (movement speeds, click frequencies) arrays of length size
+        """
+        profile = self.MOUSE_ACTIVITY_PROFILES[activity_type]
+        movement_speeds = self._mouse_rng.normal(*profile['movement_speed'], size=size)
+        click_frequencies = self._mouse_rng.normal(*profile['click_frequency'], size=size)
+        return movement_speeds, click_frequencies
 
     def _get_default_mouse_data(self):
         """Return default mouse data if real data is not available."""
@@ -198,59 +366,49 @@ class DataIntegrator:
             'filename': ['default']
         })
 
+    # Per-class column, fatigue score and (mean, std) of the simulated eye metrics
+    FACIAL_CLASS_PROFILES = {
+        'Open': {'category': 'eye_state', 'fatigue_score': 0.2,
+                 'eye_blink_rate': (15, 3), 'eye_closure_duration': (0.15, 0.05)},  # Normal blinking
+        'Closed': {'category': 'eye_state', 'fatigue_score': 0.8,
+                   'eye_blink_rate': (25, 5), 'eye_closure_duration': (0.4, 0.1)},  # Higher rate, longer closure when tired
+        'yawn': {'category': 'yawn_detection', 'fatigue_score': 0.9,
+                 'eye_blink_rate': (30, 6), 'eye_closure_duration': (0.5, 0.15)},  # Higher rate, longer closure when yawning
+        'no_yawn': {'category': 'yawn_detection', 'fatigue_score': 0.3,
+                    'eye_blink_rate': (18, 4), 'eye_closure_duration': (0.2, 0.08)},  # Normal blinking
+    }
+
     def load_facial_data(self):
-        """Load and preprocess real facial data from image datasets."""
+        """
+        Load and preprocess real facial data from image datasets.
+
+        The result is cached until a class folder changes; treat it as
+        read-only.
+        """
+        splits = [
+            ('train', os.path.join(self.facial_dir, 'train')),
+            ('test', os.path.join(self.facial_dir, 'test'))
+        ]
+        class_dirs = [os.path.join(base_dir, label) for _, base_dir in splits for label in self.FACIAL_CLASS_PROFILES]
+        return self._cached('facial', class_dirs, lambda: self._load_facial_data(splits, class_dirs))
+
+    def _load_facial_data(self, splits, class_dirs):
+        """Build the facial dataset from the (split, class) image folders."""
         try:
-            facial_data = []
+            frames = []
 
-            # Process training data
-            train_dir = os.path.join(self.facial_dir, 'train')
-            test_dir = os.path.join(self.facial_dir, 'test')
-
-            for data_split, base_dir in [('train', train_dir), ('test', test_dir)]:
-                if os.path.exists(base_dir):
-                    # Process eye state data (Open/Closed)
-                    for eye_state in ['Open', 'Closed']:
-                        eye_dir = os.path.join(base_dir, eye_state)
-                        if os.path.exists(eye_dir):
-                            image_files = glob.glob(os.path.join(eye_dir, '*.jpg'))
-
-                            for img_file in image_files:
-                                # Calculate fatigue score based on eye state
-                                eye_fatigue = 0.8 if eye_state == 'Closed' else 0.2
-
-                                facial_data.append({
-                                    'data_split': data_split,
-                                    'eye_state': eye_state,
-                                    'eye_blink_rate': self._estimate_blink_rate(eye_state),
-                                    'eye_closure_duration': self._estimate_closure_duration(eye_state),
-                                    'fatigue_score': eye_fatigue,
-                                    'filename': os.path.basename(img_file),
-                                    'category': 'eye_state'
-                                })
-
-                    # Process yawn data (yawn/no_yawn)
-                    for yawn_state in ['yawn', 'no_yawn']:
-                        yawn_dir = os.path.join(base_dir, yawn_state)
-                        if os.path.exists(yawn_dir):
-                            image_files = glob.glob(os.path.join(yawn_dir, '*.jpg'))
-
-                            for img_file in image_files:
-                                # Calculate fatigue score based on yawn state
-                                yawn_fatigue = 0.9 if yawn_state == 'yawn' else 0.3
-
-                                facial_data.append({
-                                    'data_split': data_split,
-                                    'yawn_state': yawn_state,
-                                    'eye_blink_rate': self._estimate_blink_rate_from_yawn(yawn_state),
-                                    'eye_closure_duration': self._estimate_closure_from_yawn(yawn_state),
-                                    'fatigue_score': yawn_fatigue,
-                                    'filename': os.path.basename(img_file),
-                                    'category': 'yawn_detection'
-                                })
-
-            if facial_data:
-                df = pd.DataFrame(facial_data)
+            # Scan every (split, class) directory at once
+            image_files = list_files(class_dirs, ('.jpg', '.jpeg'))
+
+            # Eye state data (Open/Closed), then yawn data (yawn/no_yawn)
+            for data_split, base_dir in splits:
+                for label in self.FACIAL_CLASS_PROFILES:
+                    filenames = image_files[os.path.join(base_dir, label)]
+                    if filenames:
+                        frames.append(self._build_facial_frame(data_split, label, filenames))
+
+            if frames:
+                df = pd.concat(frames, ignore_index=True)
                 print(f"✅ Loaded facial dataset with {len(df)} images")
                 print(f"   - Training samples: {len(df[df['data_split'] == 'train'])}")
                 print(f"   - Test samples: {len(df[df['data_split'] == 'test'])}")
@@ -263,33 +421,22 @@ class DataIntegrator:
             print(f"❌ Error loading facial data: {e}")
             return self._get_default_facial_data()
 
-    def _estimate_blink_rate(self, eye_state):
-        """Estimate blink rate based on eye state."""
-        if eye_state == 'Closed':
-            return np.random.normal(25, 5)  # Higher blink rate when tired
-        else:
-            return np.random.normal(15, 3)  # Normal blink rate
-
-    def _estimate_closure_duration(self, eye_state):
-        """Estimate eye closure duration based on eye state."""
-        if eye_state == 'Closed':
-            return np.random.normal(0.4, 0.1)  # Longer closure when tired
-        else:
-            return np.random.normal(0.15, 0.05)  # Normal closure duration
-
-    def _estimate_blink_rate_from_yawn(self, yawn_state):
-        """Estimate blink rate based on yawn state."""
-        if yawn_state == 'yawn':
-            return np.random.normal(30, 6)  # Higher blink rate when yawning
-        else:
-            return np.random.normal(18, 4)  # Normal blink rate
-
-    def _estimate_closure_from_yawn(self, yawn_state):
-        """Estimate eye closure duration based on yawn state."""
-        if yawn_state == 'yawn':
-            return np.random.normal(0.5, 0.15)  # Longer closure when yawning
-        else:
-            return np.random.normal(0.2, 0.08)  # Normal closure duration
+    def _build_facial_frame(self, data_split, label, filenames):
+        """Build the facial samples for one (split, class) directory at once."""
+        profile = self.FACIAL_CLASS_PROFILES[label]
+        size = len(filenames)
+
+        # The label goes in eye_state or yawn_state depending on the category
+        state_column = 'eye_state' if profile['category'] == 'eye_state' else 'yawn_state'
+        return with_label_dtypes(pd.DataFrame({
+            'data_split': data_split,
+            state_column: label,
+            'eye_blink_rate': self._facial_rng.normal(*profile['eye_blink_rate'], size=size),
+            'eye_closure_duration': self._facial_rng.normal(*profile['eye_closure_duration'], size=size),
+            'fatigue_score': np.full(size, profile['fatigue_score']),
+            'filename': filenames,
+            'category': profile['category']
+        }))
 
     def _get_default_facial_data(self):
         """Return default facial data if real data is not available."""
@@ -312,10 +459,15 @@ class DataIntegrator:
             DataFrame containing the integrated dataset
         """
         try:
-            # Load features from each dataset
-            keyboard_features = self.load_keyboard_data()
-            mouse_features = self.load_mouse_data()
-            facial_features = self.load_facial_data()
+            # Load features from each dataset concurrently; they read
+            # disjoint directories and return new DataFrames
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                keyboard_future = executor.submit(self.load_keyboard_data)
+                mouse_future = executor.submit(self.load_mouse_data)
+                facial_future = executor.submit(self.load_facial_data)
+            keyboard_features = keyboard_future.result()
+            mouse_features = mouse_future.result()
+            facial_features = facial_future.result()
 
             # Create a new row with all features
             # Note: Voice features and time-based features are set to default values
@@ -353,8 +505,7 @@ class DataIntegrator:
             df = pd.DataFrame([integrated_data])
 
             # Save integrated dataset
-            output_path = os.path.join(self.base_dir, 'fatique', 'datasets', 'data', 'integrated_dataset.csv')
-            df.to_csv(output_path, index=False)
+            df.to_csv(self.integrated_path, index=False)
 
             return df
 
@@ -367,19 +518,19 @@ class DataIntegrator:
         Update the default dataset with the integrated data.
         """
         try:
-            # Load the default dataset
-            default_data_path = os.path.join(self.base_dir, 'fatique', 'datasets', 'data', 'default.csv')
-            default_df = pd.read_csv(default_data_path)
-
             # Integrate new data
             integrated_df = self.integrate_datasets()
 
             if integrated_df is not None:
-                # Append new data to default dataset
-                updated_df = pd.concat([default_df, integrated_df], ignore_index=True)
-
-                # Save updated dataset
-                updated_df.to_csv(default_data_path, index=False)
+                # Append just the new rows instead of rewriting the whole file
+                if self.default_path.exists():
+                    # Match the existing column order; only the header is read
+                    columns = pd.read_csv(self.default_path, nrows=0).columns
+                    integrated_df.reindex(columns=columns).to_csv(
+                        self.default_path, mode='a', header=False, index=False
+                    )
+                else:
+                    integrated_df.to_csv(self.default_path, index=False)
 
                 print("Default dataset updated successfully!")
                 return True
@@ -387,4 +538,4 @@ class DataIntegrator:
 
         except Exception as e:
             print(f"Error updating default dataset: {str(e)}")
-            return False
\ No newline at end of file
+            return False
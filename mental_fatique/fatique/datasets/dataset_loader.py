@@ -11,17 +11,29 @@ import os
 import json
 from django.conf import settings
 
+# pandas' PyArrow CSV engine is multithreaded; fall back to the C engine
+try:
+    import pyarrow
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
 class DatasetLoader:
     def __init__(self):
         self.dataset_path = os.path.join(settings.BASE_DIR, 'fatique', 'datasets', 'data')
-        self.scaler = StandardScaler()
+        self.scaler = StandardScaler(copy=False)  # Scales the float32 matrix in place
+        self._cache = {}  # (dataset name, file mtime) -> scaled (X, y)
         
-    def load_dataset(self, dataset_name='default'):
+    def load_dataset(self, dataset_name='default', refit=False):
         """
         Load a pre-existing dataset.
         
+        Loaded datasets are cached until their file changes. The scaler is
+        fitted on the first load and reused afterwards unless refit is set.
+        
         Args:
             dataset_name: Name of the dataset to load
+            refit: Whether to refit the scaler on this dataset
             
         Returns:
             X: Feature matrix
@@ -33,16 +45,28 @@ class DatasetLoader:
         if not os.path.exists(data_path):
             raise FileNotFoundError(f"Dataset {dataset_name} not found at {data_path}")
         
-        # Load the data
-        df = pd.read_csv(data_path)
+        cache_key = (dataset_name, os.path.getmtime(data_path))
+        if not refit and cache_key in self._cache:
+            return self._cache[cache_key]
+        
+        # Load the data with a fixed schema so no type inference pass runs
+        df = pd.read_csv(data_path, engine=CSV_ENGINE, dtype=self.get_column_dtypes())
         
         # Separate features and target
-        X = df.drop('fatigue_score', axis=1)
-        y = df['fatigue_score']
+        X = df.drop(columns='fatigue_score').to_numpy(copy=False)
+        y = df['fatigue_score'].to_numpy(copy=False)
         
-        # Scale features
-        X = self.scaler.fit_transform(X)
+        # Scale features in float32; the learned statistics match so later
+        # transforms stay in float32 too
+        X = X.astype(np.float32, copy=False)
+        if refit or not hasattr(self.scaler, 'mean_'):
+            X = self.scaler.fit_transform(X)
+            self.scaler.mean_ = self.scaler.mean_.astype(np.float32)
+            self.scaler.scale_ = self.scaler.scale_.astype(np.float32)
+        else:
+            X = self.scaler.transform(X)
         
+        self._cache[cache_key] = (X, y)
         return X, y
     
     def split_dataset(self, X, y, test_size=0.2, val_size=0.1):
@@ -96,6 +120,17 @@ class DatasetLoader:
             'hour_of_day', 'day_of_week'
         ]
     
+    def get_column_dtypes(self):
+        """
+        Get the dtype of every dataset column, target included.
+        
+        Returns:
+            Dictionary mapping column names to dtypes
+        """
+        dtypes = {name: 'float32' for name in self.get_feature_names()}
+        dtypes['fatigue_score'] = 'float32'
+        return dtypes
+    
     def get_dataset_info(self, dataset_name='default'):
         """
         Get information about the dataset.
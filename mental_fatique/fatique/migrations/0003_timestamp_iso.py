@@ -0,0 +1,88 @@
+# Generated by Django 4.2 on 2026-10-16 04:15
+
+from itertools import islice
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+TIMESTAMPED_MODELS = [
+    'BehavioralData',
+    'KeyboardMetrics',
+    'MouseMetrics',
+    'FacialMetrics',
+    'VoiceMetrics',
+    'FatigueAnalysis',
+    'ProductivityRecommendation',
+]
+
+BATCH_SIZE = 500
+
+
+def format_timestamp(value):
+    # Frozen copy of DRF's ISO 8601 DateTimeField output at the time of this
+    # migration, so later changes to the model helper cannot alter it
+    value = timezone.localtime(value) if timezone.is_aware(value) else value
+    iso = value.isoformat()
+    if iso.endswith('+00:00'):
+        iso = iso[:-6] + 'Z'
+    return iso
+
+
+def backfill_timestamp_iso(apps, schema_editor):
+    for model_name in TIMESTAMPED_MODELS:
+        model = apps.get_model('fatique', model_name)
+        rows = model.objects.only('id', 'timestamp').iterator(chunk_size=BATCH_SIZE)
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            for row in batch:
+                row.timestamp_iso = format_timestamp(row.timestamp)
+            model.objects.bulk_update(batch, ['timestamp_iso'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fatique', '0002_taskperformance_attentiondata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='behavioraldata',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='facialmetrics',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='fatigueanalysis',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='keyboardmetrics',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='mousemetrics',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='productivityrecommendation',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='voicemetrics',
+            name='timestamp_iso',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(backfill_timestamp_iso, migrations.RunPython.noop),
+    ]
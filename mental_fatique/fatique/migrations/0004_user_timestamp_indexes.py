@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-16 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fatique', '0003_timestamp_iso'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facialmetrics',
+            index=models.Index(fields=['user', '-timestamp'], name='facial_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fatigueanalysis',
+            index=models.Index(fields=['user', '-timestamp'], name='fatigue_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='keyboardmetrics',
+            index=models.Index(fields=['user', '-timestamp'], name='keyboard_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mousemetrics',
+            index=models.Index(fields=['user', '-timestamp'], name='mouse_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productivitysession',
+            index=models.Index(fields=['user', '-start_time'], name='session_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productivitysession',
+            index=models.Index(condition=models.Q(('end_time__isnull', True)), fields=['user', 'start_time'], name='active_session_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voicemetrics',
+            index=models.Index(fields=['user', '-timestamp'], name='voice_user_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-16 04:22
+
+from django.db import migrations, models
+
+
+def close_duplicate_active_sessions(apps, schema_editor):
+    # Keep each user's most recent open session; end the older ones at the
+    # moment the next one started so the constraint can be created
+    ProductivitySession = apps.get_model('fatique', 'ProductivitySession')
+    open_sessions = ProductivitySession.objects.filter(
+        end_time__isnull=True
+    ).order_by('user_id', '-start_time')
+
+    newer_start = {}
+    stale = []
+    for session in open_sessions:
+        if session.user_id in newer_start:
+            session.end_time = newer_start[session.user_id]
+            stale.append(session)
+        newer_start[session.user_id] = session.start_time
+    ProductivitySession.objects.bulk_update(stale, ['end_time'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fatique', '0004_user_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_active_sessions, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='productivitysession',
+            name='active_session_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='productivitysession',
+            constraint=models.UniqueConstraint(condition=models.Q(('end_time__isnull', True)), fields=('user',), name='one_active_session'),
+        ),
+    ]
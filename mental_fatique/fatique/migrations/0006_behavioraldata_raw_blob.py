@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-16 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fatique', '0005_one_active_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='behavioraldata',
+            name='raw_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2 on 2026-10-16 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fatique', '0006_behavioraldata_raw_blob'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='attentiondata',
+            options={'verbose_name_plural': 'Attention Data'},
+        ),
+        migrations.AlterModelOptions(
+            name='behavioraldata',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='facialmetrics',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='fatigueanalysis',
+            options={'verbose_name_plural': 'Fatigue Analyses'},
+        ),
+        migrations.AlterModelOptions(
+            name='keyboardmetrics',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='mousemetrics',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='productivityrecommendation',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='taskperformance',
+            options={'verbose_name_plural': 'Task Performances'},
+        ),
+        migrations.AlterModelOptions(
+            name='voicemetrics',
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name='attentiondata',
+            index=models.Index(fields=['user', '-timestamp'], name='attention_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='behavioraldata',
+            index=models.Index(fields=['user', '-timestamp'], name='behavioral_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productivityrecommendation',
+            index=models.Index(fields=['user', '-timestamp'], name='recommendation_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskperformance',
+            index=models.Index(fields=['user', '-timestamp'], name='task_perf_user_ts_idx'),
+        ),
+    ]
@@ -1 +1,26 @@
 # Machine learning models package for mental fatigue detection
+
+import threading
+
+# Models are cached per thread: construction (TensorFlow graph build,
+# joblib loads) is paid once per worker thread, while the preprocessors'
+# per-user fitted state is never shared between concurrent requests.
+_local = threading.local()
+
+
+def get_detector():
+    """Return this thread's cached FatigueDetector, creating it on first use."""
+    detector = getattr(_local, 'detector', None)
+    if detector is None:
+        from .fatigue_detector import FatigueDetector
+        detector = _local.detector = FatigueDetector()
+    return detector
+
+
+def get_recommender():
+    """Return this thread's cached RecommendationEngine, creating it on first use."""
+    recommender = getattr(_local, 'recommender', None)
+    if recommender is None:
+        from .recommendation_engine import RecommendationEngine
+        recommender = _local.recommender = RecommendationEngine()
+    return recommender
@@ -14,6 +14,19 @@ from ..models import (
     VoiceMetrics
 )
 
+# Rows fetched per round trip when streaming metric history
+HISTORY_CHUNK_SIZE = 2000
+
+def metrics_array(query, *fields):
+    """
+    Stream the given float fields of a queryset into an (N, len(fields)) array.
+
+    Rows are fetched in chunks and copied straight into the array, so the
+    full history is never held as a list of tuples.
+    """
+    rows = query.values_list(*fields).iterator(chunk_size=HISTORY_CHUNK_SIZE)
+    return np.fromiter(rows, dtype=np.dtype((np.float64, len(fields))))
+
 class DataPreprocessor:
     def __init__(self):
         self.keyboard_scaler = StandardScaler()
@@ -177,8 +190,7 @@ class DataPreprocessor:
             cutoff_time = timezone.now() - timedelta(hours=time_window)
             query = query.filter(timestamp__gte=cutoff_time)
         
-        metrics = query.values_list('typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration')
-        return np.array(list(metrics))
+        return metrics_array(query, 'typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration')
     
     def _get_mouse_data(self, user=None, time_window=None):
         """Get mouse data as a numpy array."""
@@ -191,8 +203,7 @@ class DataPreprocessor:
             cutoff_time = timezone.now() - timedelta(hours=time_window)
             query = query.filter(timestamp__gte=cutoff_time)
         
-        metrics = query.values_list('movement_speed', 'click_frequency')
-        return np.array(list(metrics))
+        return metrics_array(query, 'movement_speed', 'click_frequency')
     
     def _get_facial_data(self, user=None, time_window=None):
         """Get facial data as a numpy array."""
@@ -205,8 +216,7 @@ class DataPreprocessor:
             cutoff_time = timezone.now() - timedelta(hours=time_window)
             query = query.filter(timestamp__gte=cutoff_time)
         
-        metrics = query.values_list('eye_blink_rate', 'eye_closure_duration')
-        return np.array(list(metrics))
+        return metrics_array(query, 'eye_blink_rate', 'eye_closure_duration')
     
     def _get_voice_data(self, user=None, time_window=None):
         """Get voice data as a numpy array."""
@@ -219,8 +229,7 @@ class DataPreprocessor:
             cutoff_time = timezone.now() - timedelta(hours=time_window)
             query = query.filter(timestamp__gte=cutoff_time)
         
-        metrics = query.values_list('speech_rate', 'pitch_variation', 'volume', 'clarity')
-        return np.array(list(metrics))
+        return metrics_array(query, 'speech_rate', 'pitch_variation', 'volume', 'clarity')
     
     def _get_latest_keyboard_metrics(self, user, time_window=24):
         """Get the latest keyboard metrics for a user."""
@@ -228,7 +237,7 @@ class DataPreprocessor:
         latest = KeyboardMetrics.objects.filter(
             user=user,
             timestamp__gte=cutoff_time
-        ).order_by('-timestamp').first()
+        ).only('typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration').order_by('-timestamp').first()
         
         if latest:
             return {
@@ -246,7 +255,7 @@ class DataPreprocessor:
         latest = MouseMetrics.objects.filter(
             user=user,
             timestamp__gte=cutoff_time
-        ).order_by('-timestamp').first()
+        ).only('movement_speed', 'click_frequency').order_by('-timestamp').first()
         
         if latest:
             return {
@@ -262,7 +271,7 @@ class DataPreprocessor:
         latest = FacialMetrics.objects.filter(
             user=user,
             timestamp__gte=cutoff_time
-        ).order_by('-timestamp').first()
+        ).only('eye_blink_rate', 'eye_closure_duration').order_by('-timestamp').first()
         
         if latest:
             return {
@@ -278,7 +287,7 @@ class DataPreprocessor:
         latest = VoiceMetrics.objects.filter(
             user=user,
             timestamp__gte=cutoff_time
-        ).order_by('-timestamp').first()
+        ).only('speech_rate', 'pitch_variation', 'volume', 'clarity').order_by('-timestamp').first()
         
         if latest:
             return {
@@ -17,6 +17,7 @@ from django.conf import settings
 from django.utils import timezone
 from ..models import FatigueAnalysis, KeyboardMetrics, MouseMetrics, FacialMetrics, VoiceMetrics
 from .data_preprocessor import DataPreprocessor
+from ..cache import invalidate_user_cache
 from ..datasets.dataset_loader import DatasetLoader
 from ..datasets.data_integrator import DataIntegrator
 
@@ -253,9 +254,15 @@ class FatigueDetector:
     def _prepare_real_model_features_from_user(self, user, time_window):
         """Prepare features for the real data model from user database data."""
         # Get latest metrics from database
-        keyboard = KeyboardMetrics.objects.filter(user=user).order_by('-timestamp').first()
-        mouse = MouseMetrics.objects.filter(user=user).order_by('-timestamp').first()
-        facial = FacialMetrics.objects.filter(user=user).order_by('-timestamp').first()
+        keyboard = KeyboardMetrics.objects.filter(user=user).only(
+            'typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration'
+        ).order_by('-timestamp').first()
+        mouse = MouseMetrics.objects.filter(user=user).only(
+            'movement_speed', 'click_frequency'
+        ).order_by('-timestamp').first()
+        facial = FacialMetrics.objects.filter(user=user).only(
+            'eye_blink_rate', 'eye_closure_duration'
+        ).order_by('-timestamp').first()
         voice = VoiceMetrics.objects.filter(user=user).order_by('-timestamp').first()
 
         features = [
@@ -345,9 +352,15 @@ class FatigueDetector:
 
         elif user:
             # Use database data
-            keyboard = KeyboardMetrics.objects.filter(user=user).order_by('-timestamp').first()
-            mouse = MouseMetrics.objects.filter(user=user).order_by('-timestamp').first()
-            facial = FacialMetrics.objects.filter(user=user).order_by('-timestamp').first()
+            keyboard = KeyboardMetrics.objects.filter(user=user).only(
+                'typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration'
+            ).order_by('-timestamp').first()
+            mouse = MouseMetrics.objects.filter(user=user).only(
+                'movement_speed', 'click_frequency'
+            ).order_by('-timestamp').first()
+            facial = FacialMetrics.objects.filter(user=user).only(
+                'eye_blink_rate', 'eye_closure_duration'
+            ).order_by('-timestamp').first()
 
             if keyboard:
                 if keyboard.error_rate > 10:
@@ -423,7 +436,7 @@ class FatigueDetector:
 
         return recommendations
 
-    def _save_analysis(self, user, fatigue_score, fatigue_level, confidence, contributing_factors, recommendations):
+    def _save_analysis(self, user, fatigue_score, fatigue_level, confidence, contributing_factors):
         """Save fatigue analysis to the database."""
         FatigueAnalysis.objects.create(
             user=user,
@@ -433,6 +446,8 @@ class FatigueDetector:
             contributing_factors=contributing_factors,
             timestamp=timezone.now()
         )
+        # Cached latest/current analyses are stale now
+        invalidate_user_cache(user.id)
 
     def save_model(self, model_path):
         """Save the model to a file."""
@@ -13,6 +13,7 @@ import random
 from django.utils import timezone
 from ..models import ProductivityRecommendation, FatigueAnalysis, ProductivitySession
 from .data_preprocessor import DataPreprocessor
+from ..cache import get_latest_fatigue
 
 class RecommendationEngine:
     def __init__(self, model_path=None):
@@ -93,24 +94,25 @@ class RecommendationEngine:
         
         return history
     
-    def get_recommendation(self, user, fatigue_analysis=None):
+    def get_recommendation(self, user, fatigue_analysis=None, *, skip_db=False):
         """
         Get a productivity recommendation for a user.
         
         Args:
             user: User to recommend for
             fatigue_analysis: Optional fatigue analysis, will fetch latest if None
+            skip_db: Trust the given fatigue analysis instead of re-reading it
             
         Returns:
             Dictionary with recommendation details
         """
         # Get fatigue analysis if not provided
+        if fatigue_analysis is None and not skip_db:
+            fatigue_analysis = get_latest_fatigue(user.id)
+        
         if fatigue_analysis is None:
-            fatigue_analysis = FatigueAnalysis.objects.filter(user=user).order_by('-timestamp').first()
-            
-            if fatigue_analysis is None:
-                # If no fatigue analysis exists, return a random recommendation
-                return self._get_random_recommendation(user)
+            # If no fatigue analysis exists, return a random recommendation
+            return self._get_random_recommendation(user, skip_db=True)
         
         # Prepare state vector
         self.preprocessor.fit(user=user, time_window=24)
@@ -122,7 +124,7 @@ class RecommendationEngine:
         
         if self.model is None:
             # If no model exists, return a random recommendation
-            return self._get_random_recommendation(user)
+            return self._get_random_recommendation(user, fatigue_analysis)
         
         # Get recommendation probabilities
         probs = self.model.predict(state)[0]
@@ -141,12 +143,13 @@ class RecommendationEngine:
         
         return recommendation
     
-    def _get_random_recommendation(self, user):
+    def _get_random_recommendation(self, user, fatigue_analysis=None, skip_db=False):
         """Generate a random recommendation when no model is available."""
         rec_type = random.choice(self.recommendation_types)
         
-        # Get the latest fatigue analysis if available
-        fatigue_analysis = FatigueAnalysis.objects.filter(user=user).order_by('-timestamp').first()
+        # Get the latest fatigue analysis if the caller has not already
+        if fatigue_analysis is None and not skip_db:
+            fatigue_analysis = get_latest_fatigue(user.id)
         
         return self._generate_recommendation(user, rec_type, fatigue_analysis)
     
@@ -338,19 +341,19 @@ class RecommendationEngine:
             True if model was updated, False otherwise
         """
         try:
-            # Get the recommendation
-            recommendation = ProductivityRecommendation.objects.get(id=recommendation_id)
+            # Update the recommendation with user feedback; only the two
+            # feedback columns are written
+            recommendations = ProductivityRecommendation.objects.filter(id=recommendation_id)
+            recommendations.update(implemented=True, effectiveness=effectiveness)
             
-            # Update the recommendation with user feedback
-            recommendation.implemented = True
-            recommendation.effectiveness = effectiveness
-            recommendation.save()
+            # Only the fields the training step reads
+            recommendation = recommendations.only('timestamp', 'recommendation_type').get()
             
             # Get the state at the time of recommendation
             fatigue_analysis = FatigueAnalysis.objects.filter(
                 user=user,
                 timestamp__lte=recommendation.timestamp
-            ).order_by('-timestamp').first()
+            ).only('fatigue_score').order_by('-timestamp').first()
             
             if fatigue_analysis is None:
                 return False
@@ -1,7 +1,38 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from rest_framework.fields import DateTimeField
+import io
 import json
+import numpy as np
+
+# Renders with the project's REST_FRAMEWORK DATETIME_FORMAT and time zone
+_api_datetime_field = DateTimeField()
+
+def format_timestamp(value):
+    """Render a datetime exactly as the API's DateTimeField would."""
+    return _api_datetime_field.to_representation(value)
+
+class IsoTimestampedQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create bypasses save(), so fill the cached timestamp here."""
+        objs = list(objs)
+        for obj in objs:
+            obj.timestamp_iso = format_timestamp(obj.timestamp)
+        return super().bulk_create(objs, *args, **kwargs)
+
+class IsoTimestampedModel(models.Model):
+    """Abstract base that caches the ISO-8601 form of ``timestamp`` at write time."""
+    timestamp_iso = models.CharField(max_length=32, blank=True, editable=False)
+
+    objects = IsoTimestampedQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.timestamp_iso = format_timestamp(self.timestamp)
+        super().save(*args, **kwargs)
+
+    class Meta:
+        abstract = True
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -15,7 +46,7 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
-class BehavioralData(models.Model):
+class BehavioralData(IsoTimestampedModel):
     DATA_TYPE_CHOICES = [
         ('keyboard', 'Keyboard'),
         ('mouse', 'Mouse'),
@@ -26,15 +57,32 @@ class BehavioralData(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='behavioral_data')
     data_type = models.CharField(max_length=20, choices=DATA_TYPE_CHOICES)
     raw_data = models.JSONField()  # Store raw data as JSON
+    raw_blob = models.BinaryField(null=True, blank=True, editable=False)  # Columnar samples as compressed .npz
     timestamp = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
         return f"{self.user.username}'s {self.data_type} data at {self.timestamp}"
 
+    @staticmethod
+    def pack_arrays(**arrays):
+        """Encode named NumPy arrays as a compressed .npz blob for raw_blob."""
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    def raw_arrays(self):
+        """Decode raw_blob back into a dict of NumPy arrays (empty if unset)."""
+        if not self.raw_blob:
+            return {}
+        with np.load(io.BytesIO(bytes(self.raw_blob)), allow_pickle=False) as npz:
+            return {name: npz[name] for name in npz.files}
+
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='behavioral_user_ts_idx'),
+        ]
 
-class KeyboardMetrics(models.Model):
+class KeyboardMetrics(IsoTimestampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='keyboard_metrics')
     typing_speed = models.FloatField()  # Words per minute
     error_rate = models.FloatField()  # Percentage of errors
@@ -46,9 +94,11 @@ class KeyboardMetrics(models.Model):
         return f"{self.user.username}'s keyboard metrics at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='keyboard_user_ts_idx'),
+        ]
 
-class MouseMetrics(models.Model):
+class MouseMetrics(IsoTimestampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='mouse_metrics')
     movement_speed = models.FloatField()  # Pixels per second
     click_frequency = models.FloatField()  # Clicks per minute
@@ -59,9 +109,11 @@ class MouseMetrics(models.Model):
         return f"{self.user.username}'s mouse metrics at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='mouse_user_ts_idx'),
+        ]
 
-class FacialMetrics(models.Model):
+class FacialMetrics(IsoTimestampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='facial_metrics')
     eye_blink_rate = models.FloatField()  # Blinks per minute
     eye_closure_duration = models.FloatField()  # Average duration of eye closure in ms
@@ -73,9 +125,11 @@ class FacialMetrics(models.Model):
         return f"{self.user.username}'s facial metrics at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='facial_user_ts_idx'),
+        ]
 
-class VoiceMetrics(models.Model):
+class VoiceMetrics(IsoTimestampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='voice_metrics')
     speech_rate = models.FloatField()  # Words per minute
     pitch_variation = models.FloatField()  # Standard deviation of pitch
@@ -87,9 +141,11 @@ class VoiceMetrics(models.Model):
         return f"{self.user.username}'s voice metrics at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='voice_user_ts_idx'),
+        ]
 
-class FatigueAnalysis(models.Model):
+class FatigueAnalysis(IsoTimestampedModel):
     FATIGUE_LEVEL_CHOICES = [
         ('low', 'Low'),
         ('moderate', 'Moderate'),
@@ -108,10 +164,12 @@ class FatigueAnalysis(models.Model):
         return f"{self.user.username}'s fatigue analysis at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='fatigue_user_ts_idx'),
+        ]
         verbose_name_plural = "Fatigue Analyses"
 
-class ProductivityRecommendation(models.Model):
+class ProductivityRecommendation(IsoTimestampedModel):
     RECOMMENDATION_TYPE_CHOICES = [
         ('break', 'Take a Break'),
         ('exercise', 'Physical Exercise'),
@@ -134,7 +192,9 @@ class ProductivityRecommendation(models.Model):
         return f"{self.user.username}'s {self.recommendation_type} recommendation at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='recommendation_user_ts_idx'),
+        ]
 
 class ProductivitySession(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='productivity_sessions')
@@ -156,6 +216,17 @@ class ProductivitySession(models.Model):
 
     class Meta:
         ordering = ['-start_time']
+        indexes = [
+            models.Index(fields=['user', '-start_time'], name='session_user_start_idx'),
+        ]
+        constraints = [
+            # At most one open session per user; also serves the active-session lookups
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(end_time__isnull=True),
+                name='one_active_session'
+            ),
+        ]
 
 # New Model for Task Performance
 class TaskPerformance(models.Model):
@@ -168,7 +239,9 @@ class TaskPerformance(models.Model):
         return f"{self.user.username}'s performance on '{self.task_label}' at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='task_perf_user_ts_idx'),
+        ]
         verbose_name_plural = "Task Performances"
 
 # New Model for Attention Data
@@ -181,5 +254,7 @@ class AttentionData(models.Model):
         return f"{self.user.username}'s attention level at {self.timestamp}"
 
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='attention_user_ts_idx'),
+        ]
         verbose_name_plural = "Attention Data"
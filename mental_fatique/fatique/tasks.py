@@ -0,0 +1,101 @@
+"""
+Background tasks that keep ML inference off the request thread.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import close_old_connections
+from .ml_models import get_detector, get_recommender
+from .cache import (
+    RECOMMENDATION_TIMEOUT,
+    get_latest_fatigue,
+    invalidate_user_cache,
+    recommendation_key
+)
+
+# A single dedicated worker acts as the ML queue, so heavy inference never
+# competes with request handling and the model is never run concurrently.
+_ml_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fatigue-ml')
+
+# (task function, user id) pairs queued but not yet finished
+_pending_tasks = set()
+_pending_lock = threading.Lock()
+
+
+def run_fatigue_prediction(user_id):
+    """Run a fatigue prediction for a user and store the resulting analysis."""
+    close_old_connections()
+    try:
+        user = User.objects.get(pk=user_id)
+        result = get_detector().predict(user)
+        invalidate_user_cache(user_id)
+        return result
+    except Exception as e:
+        print(f"❌ Error in background fatigue prediction: {e}")
+    finally:
+        _finish(run_fatigue_prediction, user_id)
+        close_old_connections()
+
+
+def run_recommendation(user_id):
+    """Generate a recommendation for a user's latest fatigue level and cache it."""
+    close_old_connections()
+    try:
+        latest = get_latest_fatigue(user_id)
+        if latest is None:
+            return None
+        user = User.objects.get(pk=user_id)
+        recommendation = get_recommender().get_recommendation(user, latest, skip_db=True)
+        cache.set(
+            recommendation_key(user_id, latest.fatigue_level),
+            recommendation,
+            timeout=RECOMMENDATION_TIMEOUT
+        )
+        return recommendation
+    except Exception as e:
+        print(f"❌ Error in background recommendation: {e}")
+    finally:
+        _finish(run_recommendation, user_id)
+        close_old_connections()
+
+
+def _enqueue(task, user_id):
+    """Submit a task for a user unless the same one is still queued."""
+    with _pending_lock:
+        if (task, user_id) in _pending_tasks:
+            return False
+        _pending_tasks.add((task, user_id))
+
+    _ml_executor.submit(task, user_id)
+    return True
+
+
+def _finish(task, user_id):
+    with _pending_lock:
+        _pending_tasks.discard((task, user_id))
+
+
+def enqueue_fatigue_prediction(user_id):
+    """
+    Schedule a fatigue prediction on the ML worker.
+
+    Repeat requests for a user whose prediction is still queued are coalesced.
+
+    Returns:
+        True if a new prediction was queued
+    """
+    return _enqueue(run_fatigue_prediction, user_id)
+
+
+def enqueue_recommendation(user_id):
+    """
+    Schedule a recommendation for a user's latest fatigue level on the ML worker.
+
+    Repeat requests for a user whose recommendation is still queued are coalesced.
+
+    Returns:
+        True if a new recommendation was queued
+    """
+    return _enqueue(run_recommendation, user_id)
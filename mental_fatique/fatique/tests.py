@@ -1,3 +1,186 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .api import views
+from .data_collection.storage import IngestBuffer
+from .models import BehavioralData, FatigueAnalysis, KeyboardMetrics
+
+# The facial analyzer needs OpenCV, dlib and face_recognition at import time
+try:
+    from .data_collection import facial_analyzer
+    FACIAL_ANALYZER_AVAILABLE = True
+    NUMBA_AVAILABLE = facial_analyzer.NUMBA_AVAILABLE
+except ImportError:
+    FACIAL_ANALYZER_AVAILABLE = NUMBA_AVAILABLE = False
+
+
+@skipUnless(FACIAL_ANALYZER_AVAILABLE, 'facial analyzer dependencies not installed')
+class EyeAspectRatioTests(SimpleTestCase):
+    def test_degenerate_eye_returns_zero(self):
+        pts = np.zeros((68, 2), np.int32)
+        self.assertEqual(facial_analyzer._eye_aspect_ratio(pts, facial_analyzer.LEFT_EYE), 0.0)
+
+    def test_open_eye(self):
+        pts = np.zeros((68, 2), np.int32)
+        start = facial_analyzer.LEFT_EYE
+        pts[start:start + 6] = [(0, 0), (1, -1), (2, -1), (3, 0), (2, 1), (1, 1)]
+        self.assertAlmostEqual(facial_analyzer._eye_aspect_ratio(pts, start), 2 / 3)
+
+
+@skipUnless(FACIAL_ANALYZER_AVAILABLE, 'facial analyzer dependencies not installed')
+class FrameKernelTests(SimpleTestCase):
+    def test_degenerate_landmarks(self):
+        pts = np.zeros((68, 2), np.int32)
+        ear, expression, nose, chin = facial_analyzer.frame_kernel(pts, 0.25)
+        self.assertEqual(ear, 0.0)
+        self.assertEqual(expression, facial_analyzer.NEUTRAL)
+        self.assertEqual((nose, chin), ((0, 0), (0, 0)))
+
+    @skipUnless(NUMBA_AVAILABLE, 'numba not installed')
+    def test_jit_matches_python(self):
+        pts = np.zeros((68, 2), np.int32)
+        self.assertEqual(
+            facial_analyzer.frame_kernel(pts, 0.25),
+            facial_analyzer.frame_kernel.py_func(pts, 0.25)
+        )
+
+
+def call_view(viewset, actions, user, method='get', path='/', data=None, **kwargs):
+    request = getattr(APIRequestFactory(), method)(path, data, format='json')
+    force_authenticate(request, user)
+    response = viewset.as_view(actions)(request, **kwargs)
+    response.render()
+    return response
+
+
+class FatigueHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('history', password='x')
+        for timestamp, score in (
+            (datetime(2024, 1, 7, 10, 15), 10),  # Sunday
+            (datetime(2024, 1, 8, 9, 0), 20),  # Monday
+            (datetime(2024, 1, 8, 9, 30), 40),
+        ):
+            FatigueAnalysis.objects.create(
+                user=self.user,
+                fatigue_level='low',
+                fatigue_score=score,
+                confidence=1.0,
+                contributing_factors={},
+                timestamp=timestamp.replace(tzinfo=dt_timezone.utc)
+            )
+
+    def history(self, interval):
+        response = call_view(
+            views.FatigueAnalysisViewSet, {'post': 'history'}, self.user, 'post',
+            data={'start_date': '2024-01-01T00:00:00Z', 'end_date': '2024-01-31T00:00:00Z', 'interval': interval}
+        )
+        self.assertEqual(response.status_code, 200)
+        return [(row['timestamp'], row['fatigue_score'], row['count']) for row in response.data]
+
+    def test_hour_buckets(self):
+        self.assertEqual(self.history('hour'), [('2024-01-07 10:00', 10, 1), ('2024-01-08 09:00', 30, 2)])
+
+    def test_day_buckets(self):
+        self.assertEqual(self.history('day'), [('2024-01-07', 10, 1), ('2024-01-08', 30, 2)])
+
+    def test_week_buckets_use_monday_week_numbers(self):
+        # TruncWeek starts weeks on Monday, so labels use %W rather than %U
+        self.assertEqual(self.history('week'), [('2024-01', 10, 1), ('2024-02', 30, 2)])
+
+
+class ProductivitySessionTests(TestCase):
+    def test_second_active_session_is_rejected(self):
+        user = User.objects.create_user('sessions', password='x')
+        data = {'user': user.id, 'start_time': '2024-01-08T09:00:00Z'}
+        first = call_view(views.ProductivitySessionViewSet, {'post': 'create'}, user, 'post', data=data)
+        second = call_view(views.ProductivitySessionViewSet, {'post': 'create'}, user, 'post', data=data)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 400)
+        self.assertIn('error', second.data)
+
+
+class BehavioralDataRawTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('raw', password='x')
+        self.row = BehavioralData.objects.create(user=self.user, data_type='keyboard', raw_data={'keys': 3})
+
+    def list_rows(self, path):
+        response = call_view(views.BehavioralDataViewSet, {'get': 'list'}, self.user, path=path)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_list_omits_raw_data(self):
+        self.assertNotIn('raw_data', self.list_rows('/')[0])
+
+    def test_list_includes_raw_data_on_request(self):
+        self.assertEqual(self.list_rows('/?include_raw=1')[0]['raw_data'], {'keys': 3})
+
+    def test_detail_includes_raw_data(self):
+        response = call_view(views.BehavioralDataViewSet, {'get': 'retrieve'}, self.user, pk=self.row.pk)
+        self.assertEqual(response.data['raw_data'], {'keys': 3})
+
+
+class DataCollectionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('collector', password='x')
+
+    def post(self, data):
+        request = APIRequestFactory().post('/', data, format='json')
+        force_authenticate(request, self.user)
+        return views.data_collection(request)
+
+    def test_invalid_snapshot_is_rejected(self):
+        with mock.patch.object(views, '_ingest_buffer') as buffer:
+            response = self.post({'typing': {'typingSpeed': 'fast'}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('typing', response.data['errors'])
+        buffer.add.assert_not_called()
+
+    def test_snapshots_are_coerced_and_buffered(self):
+        with mock.patch.object(views, '_ingest_buffer') as buffer:
+            response = self.post({'typing': {'typingSpeed': '42.5'}, 'mouse': [{}, {}]})
+        self.assertEqual(response.status_code, 202)
+        user_id, rows = buffer.add.call_args.args
+        self.assertEqual(user_id, self.user.id)
+        self.assertEqual([type(row).__name__ for row in rows], ['KeyboardMetrics', 'MouseMetrics', 'MouseMetrics'])
+        self.assertEqual(rows[0].typing_speed, 42.5)
+
+
+class IngestBufferTests(TestCase):
+    def setUp(self):
+        self.flushed = []
+        # Long interval so only the explicit flush() writes
+        self.buffer = IngestBuffer(flush_interval=3600, on_flush=self.flushed.append)
+        self.first = User.objects.create_user('first', password='x')
+        self.second = User.objects.create_user('second', password='x')
+
+    def keyboard_row(self, user, typing_speed):
+        return KeyboardMetrics(
+            user=user, typing_speed=typing_speed, error_rate=0, pause_frequency=0, key_press_duration=0
+        )
+
+    def test_flush_writes_buffered_rows(self):
+        self.buffer.add(self.first.id, [self.keyboard_row(self.first, 40)])
+        self.buffer.add(self.second.id, [self.keyboard_row(self.second, 50)])
+        self.buffer.flush()
+        self.assertEqual(KeyboardMetrics.objects.count(), 2)
+        self.assertEqual(self.flushed, [{self.first.id, self.second.id}])
+
+    def test_failed_rows_do_not_drop_other_users(self):
+        self.buffer.add(self.first.id, [self.keyboard_row(self.first, 40)])
+        self.buffer.add(self.second.id, [self.keyboard_row(self.second, None)])
+        with self.assertLogs('fatique.data_collection.storage', level='ERROR') as logs:
+            self.buffer.flush()
+        self.assertEqual(list(KeyboardMetrics.objects.values_list('user_id', flat=True)), [self.first.id])
+        self.assertEqual(self.flushed, [{self.first.id}])
+        self.assertEqual(len(logs.records), 2)
+
+    def test_flush_without_rows_is_a_no_op(self):
+        self.buffer.flush()
+        self.assertEqual(self.flushed, [])
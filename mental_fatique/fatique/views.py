@@ -3,6 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 import json
 
@@ -13,8 +14,7 @@ from .models import (
     FatigueAnalysis
 )
 
-from .ml_models.fatigue_detector import FatigueDetector
-from .ml_models.recommendation_engine import RecommendationEngine
+from .ml_models import get_detector, get_recommender
 from .data_collection.data_collector import DataCollector
 
 def index(request):
@@ -59,7 +59,7 @@ def get_fatigue_analysis(request):
     user = request.user
 
     # Create a fatigue detector
-    detector = FatigueDetector()
+    detector = get_detector()
 
     # Get the analysis
     analysis = detector.predict(user)
@@ -72,7 +72,7 @@ def get_recommendation(request):
     user = request.user
 
     # Create a recommendation engine
-    engine = RecommendationEngine()
+    engine = get_recommender()
 
     # Get a recommendation
     recommendation = engine.get_recommendation(user)
@@ -93,7 +93,7 @@ def recommendation_feedback(request):
         effectiveness = data.get('effectiveness', 0.0)
 
         # Create a recommendation engine
-        engine = RecommendationEngine()
+        engine = get_recommender()
 
         # Update the model
         if implemented:
@@ -109,24 +109,19 @@ def start_session(request):
     """Start a new productivity session."""
     user = request.user
 
-    # Check if there's already an active session
-    active_session = ProductivitySession.objects.filter(
-        user=user,
-        end_time__isnull=True
-    ).exists()
-
-    if active_session:
+    # The one_active_session constraint rejects a second open session
+    try:
+        with transaction.atomic():
+            session = ProductivitySession.objects.create(
+                user=user,
+                start_time=timezone.now()
+            )
+    except IntegrityError:
         return JsonResponse(
             {'status': 'error', 'message': 'There is already an active session'},
             status=400
         )
 
-    # Create a new session
-    session = ProductivitySession.objects.create(
-        user=user,
-        start_time=timezone.now()
-    )
-
     # Start tracking
     start_tracking(request)
 
@@ -142,7 +137,11 @@ def end_session(request, session_id):
     user = request.user
 
     try:
-        session = ProductivitySession.objects.get(id=session_id, user=user)
+        # The response only needs the times, so leave fatigue_progression
+        # and notes unloaded
+        session = ProductivitySession.objects.only(
+            'id', 'start_time', 'end_time'
+        ).get(id=session_id, user=user)
 
         if session.end_time is not None:
             return JsonResponse(
@@ -152,7 +151,7 @@ def end_session(request, session_id):
 
         # End the session
         session.end_time = timezone.now()
-        session.save()
+        session.save(update_fields=['end_time'])
 
         # Stop tracking
         stop_tracking(request)
@@ -177,7 +176,7 @@ def dashboard_api(request):
 
     # 1. Get Current Fatigue Level and Score
     # Assuming FatigueDetector can provide the latest analysis for a user
-    detector = FatigueDetector()
+    detector = get_detector()
     current_fatigue_analysis = detector.predict(user)
 
     # Default structure if analysis fails or is incomplete
@@ -191,7 +190,9 @@ def dashboard_api(request):
     try:
         # Fetch recent fatigue analyses, ordered by timestamp
         # Use FatigueAnalysis model which has the fatigue_score field
-        recent_analyses = FatigueAnalysis.objects.filter(user=user).order_by('-timestamp')[:50]
+        recent_analyses = FatigueAnalysis.objects.filter(user=user).only(
+            'timestamp', 'fatigue_score'
+        ).order_by('-timestamp')[:50]
         fatigue_history_data = [{'timestamp': analysis.timestamp.isoformat(), 'score': analysis.fatigue_score} for analysis in recent_analyses]
     except Exception as e:
         print(f"Error fetching fatigue history: {e}")
@@ -210,7 +211,7 @@ def dashboard_api(request):
 
     # 4. Get Recent Recommendations
     # Assuming RecommendationEngine can provide recent recommendations for a user.
-    engine = RecommendationEngine()
+    engine = get_recommender()
     # You might need to add a method like get_recent_recommendations to your RecommendationEngine class
     # This method should return a list of strings.
     try:
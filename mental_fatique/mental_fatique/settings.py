@@ -32,6 +32,7 @@ ALLOWED_HOSTS = []
 
 INSTALLED_APPS = [
     'fatique',
+    'fatigue_analysis',
     'rest_framework',
     'corsheaders',
     'django.contrib.admin',
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,10 +86,41 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests so the polled dashboard and
+        # current-fatigue endpoints do not reconnect on every call. Set to 0
+        # when running behind a transaction-pooling pgbouncer.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 
+# Cache
+# Shared Redis cache when REDIS_URL is set (requires the redis package),
+# otherwise a per-process in-memory cache for development
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Batched writes
+# Rows per INSERT when collected data is bulk-created. 100-500 balances
+# round-trips against statement size and memory on large ingests.
+
+FATIGUE_BULK_BATCH_SIZE = int(os.environ.get('FATIGUE_BULK_BATCH_SIZE', 100))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -80,76 +80,46 @@ def test_real_datasets():
     print("\n4. 🔗 Testing Dataset Integration...")
     try:
         # Create a comprehensive dataset by combining samples from all modalities
-        combined_data = []
+        # Features a modality does not provide are filled with these defaults
+        defaults = {
+            'typing_speed': 45,
+            'error_rate': 5,
+            'pause_frequency': 3,
+            'key_press_duration': 120,
+            'movement_speed': 100,
+            'click_frequency': 5,
+            'eye_blink_rate': 20,
+            'eye_closure_duration': 0.2,
+            'speech_rate': 120,
+            'pitch_variation': 0.8,
+            'volume': 0.9,
+            'clarity': 0.85,
+            'hour_of_day': 12,
+            'day_of_week': 1
+        }
+        column_order = list(defaults) + ['fatigue_score', 'data_source']
+        
+        def sample(df, source, columns):
+            """First 10 rows of a modality's own columns, with defaults broadcast for the rest."""
+            missing = {name: value for name, value in defaults.items() if name not in columns}
+            return df.head(10)[columns + ['fatigue_score']].assign(**missing, data_source=source)[column_order]
+        
+        frames = []
         
         # Sample from keyboard data
         if 'keyboard_df' in locals() and len(keyboard_df) > 0:
-            for _, row in keyboard_df.head(10).iterrows():
-                combined_data.append({
-                    'typing_speed': row['typing_speed'],
-                    'error_rate': row['error_rate'],
-                    'pause_frequency': row['pause_frequency'],
-                    'key_press_duration': row['key_press_duration'],
-                    'movement_speed': 100,  # Default
-                    'click_frequency': 5,   # Default
-                    'eye_blink_rate': 20,   # Default
-                    'eye_closure_duration': 0.2,  # Default
-                    'speech_rate': 120,     # Default
-                    'pitch_variation': 0.8, # Default
-                    'volume': 0.9,          # Default
-                    'clarity': 0.85,        # Default
-                    'hour_of_day': 12,      # Default
-                    'day_of_week': 1,       # Default
-                    'fatigue_score': row['fatigue_score'],
-                    'data_source': 'keyboard'
-                })
+            frames.append(sample(keyboard_df, 'keyboard', ['typing_speed', 'error_rate', 'pause_frequency', 'key_press_duration']))
         
         # Sample from mouse data
         if 'mouse_df' in locals() and len(mouse_df) > 0:
-            for _, row in mouse_df.head(10).iterrows():
-                combined_data.append({
-                    'typing_speed': 45,     # Default
-                    'error_rate': 5,        # Default
-                    'pause_frequency': 3,   # Default
-                    'key_press_duration': 120,  # Default
-                    'movement_speed': row['movement_speed'],
-                    'click_frequency': row['click_frequency'],
-                    'eye_blink_rate': 20,   # Default
-                    'eye_closure_duration': 0.2,  # Default
-                    'speech_rate': 120,     # Default
-                    'pitch_variation': 0.8, # Default
-                    'volume': 0.9,          # Default
-                    'clarity': 0.85,        # Default
-                    'hour_of_day': 12,      # Default
-                    'day_of_week': 1,       # Default
-                    'fatigue_score': row['fatigue_score'],
-                    'data_source': 'mouse'
-                })
+            frames.append(sample(mouse_df, 'mouse', ['movement_speed', 'click_frequency']))
         
         # Sample from facial data
         if 'facial_df' in locals() and len(facial_df) > 0:
-            for _, row in facial_df.head(10).iterrows():
-                combined_data.append({
-                    'typing_speed': 45,     # Default
-                    'error_rate': 5,        # Default
-                    'pause_frequency': 3,   # Default
-                    'key_press_duration': 120,  # Default
-                    'movement_speed': 100,  # Default
-                    'click_frequency': 5,   # Default
-                    'eye_blink_rate': row['eye_blink_rate'],
-                    'eye_closure_duration': row['eye_closure_duration'],
-                    'speech_rate': 120,     # Default
-                    'pitch_variation': 0.8, # Default
-                    'volume': 0.9,          # Default
-                    'clarity': 0.85,        # Default
-                    'hour_of_day': 12,      # Default
-                    'day_of_week': 1,       # Default
-                    'fatigue_score': row['fatigue_score'],
-                    'data_source': 'facial'
-                })
+            frames.append(sample(facial_df, 'facial', ['eye_blink_rate', 'eye_closure_duration']))
         
-        if combined_data:
-            combined_df = pd.DataFrame(combined_data)
+        if frames:
+            combined_df = pd.concat(frames, ignore_index=True)
             print(f"   ✅ Combined dataset created successfully!")
             print(f"   📊 Dataset shape: {combined_df.shape}")
             print(f"   📈 Fatigue score range: {combined_df['fatigue_score'].min():.3f} - {combined_df['fatigue_score'].max():.3f}")
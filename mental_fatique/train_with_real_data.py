@@ -26,6 +26,46 @@ django.setup()
 
 from fatique.datasets.data_integrator import DataIntegrator
 
+# Distributions for features a dataset does not provide: (mean, std)
+SIMULATED_FEATURES = {
+    'typing_speed': (45, 10),
+    'error_rate': (5, 2),
+    'pause_frequency': (3, 1),
+    'key_press_duration': (120, 20),
+    'movement_speed': (120, 30),
+    'click_frequency': (8, 3),
+    'eye_blink_rate': (20, 5),
+    'eye_closure_duration': (0.2, 0.05),
+    'speech_rate': (120, 20),      # Default
+    'pitch_variation': (0.8, 0.2), # Default
+    'volume': (0.9, 0.1),          # Default
+    'clarity': (0.85, 0.1)         # Default
+}
+
+def simulated_columns(rng, n, source, **real_columns):
+    """
+    Build n training rows as columns: real columns where given, simulated otherwise.
+
+    Args:
+        rng: numpy Generator shared across the whole training set
+        n: Number of rows
+        source: Value for the data_source column
+        **real_columns: Arrays of length n taken from the dataset
+
+    Returns:
+        Dictionary of column name to array
+    """
+    fatigue_score = real_columns.pop('fatigue_score')
+    columns = {
+        name: real_columns[name] if name in real_columns else rng.normal(mean, std, n)
+        for name, (mean, std) in SIMULATED_FEATURES.items()
+    }
+    columns['hour_of_day'] = rng.integers(8, 22, n)  # Work hours
+    columns['day_of_week'] = rng.integers(1, 8, n)   # 1-7
+    columns['fatigue_score'] = fatigue_score
+    columns['data_source'] = np.full(n, source, dtype=object)
+    return columns
+
 def prepare_training_data():
     """Prepare comprehensive training data from all real datasets."""
     
@@ -39,80 +79,47 @@ def prepare_training_data():
     mouse_df = integrator.load_mouse_data()
     facial_df = integrator.load_facial_data()
     
-    # Create comprehensive training samples
-    training_data = []
+    # One generator for every simulated column keeps runs reproducible
+    rng = np.random.default_rng(42)
     
     # Process keyboard data (100 samples)
     print(f"Processing {len(keyboard_df)} keyboard samples...")
-    for _, row in keyboard_df.iterrows():
-        training_data.append({
-            'typing_speed': row['typing_speed'],
-            'error_rate': row['error_rate'],
-            'pause_frequency': row['pause_frequency'],
-            'key_press_duration': row['key_press_duration'],
-            'movement_speed': np.random.normal(120, 30),  # Simulated
-            'click_frequency': np.random.normal(8, 3),    # Simulated
-            'eye_blink_rate': np.random.normal(20, 5),    # Simulated
-            'eye_closure_duration': np.random.normal(0.2, 0.05),  # Simulated
-            'speech_rate': np.random.normal(120, 20),     # Default
-            'pitch_variation': np.random.normal(0.8, 0.2), # Default
-            'volume': np.random.normal(0.9, 0.1),         # Default
-            'clarity': np.random.normal(0.85, 0.1),       # Default
-            'hour_of_day': np.random.randint(8, 22),      # Work hours
-            'day_of_week': np.random.randint(1, 8),       # 1-7
-            'fatigue_score': row['fatigue_score'],
-            'data_source': 'keyboard'
-        })
+    keyboard_columns = simulated_columns(
+        rng, len(keyboard_df), 'keyboard',
+        typing_speed=keyboard_df['typing_speed'].to_numpy(),
+        error_rate=keyboard_df['error_rate'].to_numpy(),
+        pause_frequency=keyboard_df['pause_frequency'].to_numpy(),
+        key_press_duration=keyboard_df['key_press_duration'].to_numpy(),
+        fatigue_score=keyboard_df['fatigue_score'].to_numpy()
+    )
     
     # Process mouse data (22 samples, expand with variations)
     print(f"Processing {len(mouse_df)} mouse samples...")
-    for _, row in mouse_df.iterrows():
-        # Create multiple variations of each mouse session
-        for variation in range(5):  # 5 variations per session
-            training_data.append({
-                'typing_speed': np.random.normal(45, 10),  # Simulated
-                'error_rate': np.random.normal(5, 2),      # Simulated
-                'pause_frequency': np.random.normal(3, 1), # Simulated
-                'key_press_duration': np.random.normal(120, 20),  # Simulated
-                'movement_speed': row['movement_speed'] + np.random.normal(0, 10),
-                'click_frequency': row['click_frequency'] + np.random.normal(0, 1),
-                'eye_blink_rate': np.random.normal(20, 5),    # Simulated
-                'eye_closure_duration': np.random.normal(0.2, 0.05),  # Simulated
-                'speech_rate': np.random.normal(120, 20),     # Default
-                'pitch_variation': np.random.normal(0.8, 0.2), # Default
-                'volume': np.random.normal(0.9, 0.1),         # Default
-                'clarity': np.random.normal(0.85, 0.1),       # Default
-                'hour_of_day': np.random.randint(8, 22),      # Work hours
-                'day_of_week': np.random.randint(1, 8),       # 1-7
-                'fatigue_score': row['fatigue_score'] + np.random.normal(0, 0.05),
-                'data_source': 'mouse'
-            })
+    variations = 5  # 5 variations per session
+    n_mouse = len(mouse_df) * variations
+    mouse_columns = simulated_columns(
+        rng, n_mouse, 'mouse',
+        movement_speed=np.repeat(mouse_df['movement_speed'].to_numpy(), variations) + rng.normal(0, 10, n_mouse),
+        click_frequency=np.repeat(mouse_df['click_frequency'].to_numpy(), variations) + rng.normal(0, 1, n_mouse),
+        fatigue_score=np.repeat(mouse_df['fatigue_score'].to_numpy(), variations) + rng.normal(0, 0.05, n_mouse)
+    )
     
     # Process facial data (sample 200 from 2900 to balance dataset)
     print(f"Processing sample of {min(200, len(facial_df))} facial samples...")
     facial_sample = facial_df.sample(n=min(200, len(facial_df)), random_state=42)
-    for _, row in facial_sample.iterrows():
-        training_data.append({
-            'typing_speed': np.random.normal(45, 10),  # Simulated
-            'error_rate': np.random.normal(5, 2),      # Simulated
-            'pause_frequency': np.random.normal(3, 1), # Simulated
-            'key_press_duration': np.random.normal(120, 20),  # Simulated
-            'movement_speed': np.random.normal(120, 30),  # Simulated
-            'click_frequency': np.random.normal(8, 3),    # Simulated
-            'eye_blink_rate': row['eye_blink_rate'],
-            'eye_closure_duration': row['eye_closure_duration'],
-            'speech_rate': np.random.normal(120, 20),     # Default
-            'pitch_variation': np.random.normal(0.8, 0.2), # Default
-            'volume': np.random.normal(0.9, 0.1),         # Default
-            'clarity': np.random.normal(0.85, 0.1),       # Default
-            'hour_of_day': np.random.randint(8, 22),      # Work hours
-            'day_of_week': np.random.randint(1, 8),       # 1-7
-            'fatigue_score': row['fatigue_score'],
-            'data_source': 'facial'
-        })
+    facial_columns = simulated_columns(
+        rng, len(facial_sample), 'facial',
+        eye_blink_rate=facial_sample['eye_blink_rate'].to_numpy(),
+        eye_closure_duration=facial_sample['eye_closure_duration'].to_numpy(),
+        fatigue_score=facial_sample['fatigue_score'].to_numpy()
+    )
     
     # Convert to DataFrame
-    training_df = pd.DataFrame(training_data)
+    sources = (keyboard_columns, mouse_columns, facial_columns)
+    training_df = pd.DataFrame({
+        name: np.concatenate([columns[name] for columns in sources])
+        for name in keyboard_columns
+    })
     
     # Clean and validate data
     training_df = training_df.dropna()